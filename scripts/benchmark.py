@@ -0,0 +1,213 @@
+import io
+import os
+import sys
+import json
+import platform
+import resource
+import traceback
+import contextlib
+import multiprocessing as mp
+from time import *
+
+import numpy as np
+from scipy.sparse import csgraph
+
+from graph import Graph
+from pajek import read_pajek
+from models import erdos_renyi, barabasi_albert
+from stats import graph_info
+from paths import approx_dists
+from centrality import distance_centralities, approx_betweenness
+from spectral import Spectral
+from triangles import clustering
+from cores import core_numbers
+from clusters import clusters_info
+from propagation import label_propagation
+
+def _lcc(K):
+  """
+  Binary adjacency of largest connected component of compact graph K without self-loops.
+  """
+
+  A = K.adjacency(multi = False)
+  A.setdiag(0)
+  A.eliminate_zeros()
+
+  _, labels = csgraph.connected_components(A, directed = False)
+  lcc = np.flatnonzero(labels == np.bincount(labels).argmax())
+
+  return A[lcc][:, lcc]
+
+STAGES = {
+  'graph_info': lambda K, G: graph_info(K),
+  'approx_dists': lambda K, G: approx_dists(_lcc(K), seed = 0),
+  'closeness': lambda K, G: distance_centralities(K, betweenness = False),
+  'betweenness': lambda K, G: approx_betweenness(K, k = 15, seed = 0),
+  'pagerank': lambda K, G: Spectral(K).pagerank(),
+  'clustering': lambda K, G: clustering(K),
+  'k_core': lambda K, G: core_numbers(K),
+  'clusters_info': lambda K, G: clusters_info(G, label_propagation, 'LPA', 1)
+}
+
+FILES = ['karate', 'dolphins', 'darknet', 'ppi', 'ingredients']
+
+SIZES = [1000, 2000, 4000, 8000, 16000]
+
+def _rss():
+  """
+  Peak resident memory of this process and of its largest child process in bytes.
+  """
+
+  return 1024 * max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+def _measure(stage, K, G, conn):
+  """
+  Run stage once in forked process and send its time and peak memory increase or traceback of error.
+  """
+
+  try:
+    start = _rss()
+    tic = time()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+      STAGES[stage](K, G)
+
+    conn.send(('ok', (time() - tic, _rss() - start)))
+  except BaseException:
+    conn.send(('error', traceback.format_exc()))
+  finally:
+    conn.close()
+
+def measure(stage, K, G = None):
+  """
+  Measure time and peak memory of stage on compact graph K and NetworkX graph G.
+
+  Each measurement runs in a freshly forked process, so that peak memory
+  reflects only the stage itself. Errors in the stage are raised again with
+  their original traceback, as is abnormal exit of the process.
+  """
+
+  ctx = mp.get_context('fork')
+  parent, child = ctx.Pipe(duplex = False)
+
+  proc = ctx.Process(target = _measure, args = (stage, K, G, child))
+  proc.start()
+  child.close()
+
+  try:
+    status, result = parent.recv()
+  except EOFError:
+    status, result = 'error', None
+  finally:
+    parent.close()
+    proc.join()
+
+  if status == 'error':
+    raise RuntimeError("Stage '{:s}' failed:\n{:s}".format(stage, result or 'process exited with code {}'.format(proc.exitcode)))
+
+  return result
+
+def graphs(files = FILES, sizes = SIZES, k = 5, seed = 0):
+  """
+  Generate bundled networks and seeded Erdös-Rényi and Barabási–Albert graphs of growing size with average degree 2k.
+  """
+
+  for file in files:
+    yield 'nets', file, read_pajek(file)
+
+  for n in sizes:
+    labels, clusters = np.arange(1, n + 1).astype(str), np.ones(n)
+
+    yield 'Erdös-Rényi', 'ER-{:d}'.format(n), Graph('Erdös-Rényi', labels, clusters, *erdos_renyi(n, n * k, seed))
+    yield 'Barabási–Albert', 'BA-{:d}'.format(n), Graph('Barabási–Albert', labels, clusters, *barabasi_albert(n, k, seed))
+
+def scaling(results):
+  """
+  Fit empirical scaling exponents of runtimes with numbers of edges for each model and stage.
+
+  Exponent is the slope of least-squares line through log-log points.
+  """
+
+  exponents = {}
+  for model in sorted({r['model'] for r in results if r['model'] != 'nets'}):
+    exponents[model] = {}
+    for stage in STAGES:
+      points = [(r['edges'], r['time']) for r in results if r['model'] == model and r['stage'] == stage and r['time'] > 0]
+      if len(points) > 1:
+        x, y = np.log(np.array(points)).T
+        exponents[model][stage] = float(np.polyfit(x, y, 1)[0])
+
+  return exponents
+
+def benchmark(stages = None, files = FILES, sizes = SIZES, seed = 0):
+  """
+  Run and print out benchmark of pipeline stages on bundled networks and generated graphs.
+
+  Returns dictionary with environment, time and peak memory of each stage on
+  each graph, and scaling exponents of stages for each graph model.
+  """
+
+  stages = list(STAGES) if stages is None else stages
+
+  results = []
+  for model, name, K in graphs(files, sizes, seed = seed):
+    G = K.to_networkx(multi = False) if 'clusters_info' in stages else None
+
+    for stage in stages:
+      t, memory = measure(stage, K, G)
+      results.append({'model': model, 'graph': name, 'nodes': len(K), 'edges': K.number_of_edges(), 'stage': stage, 'time': t, 'memory': memory})
+
+      print("{0:>15s} | '{1:s}' {2:.3f} sec ({3:,.1f} MB)".format(stage, name, t, memory / 2**20))
+    print()
+
+  exponents = scaling(results)
+  for model in exponents:
+    print("{0:>15s} | '{1:s}'".format('Scaling', model))
+    for stage, b in exponents[model].items():
+      print("{0:>15s} | m^{1:.2f}".format(stage, b))
+    print()
+
+  return {'python': platform.python_version(), 'numpy': np.__version__, 'cpus': os.cpu_count(), 'date': strftime('%Y-%m-%d %H:%M:%S'), 'results': results, 'scaling': exponents}
+
+def regressions(current, baseline, threshold = 1.25, seconds = 0.05, memory = 2**24):
+  """
+  Find stages whose runtime or peak memory grew beyond threshold relative to baseline results.
+
+  Runtimes below seconds and peak memory below memory bytes in both runs are
+  ignored as noise. Returns list of flagged stages with both measurements.
+  """
+
+  before = {(r['graph'], r['stage']): r for r in baseline['results']}
+
+  flagged = []
+  for r in current['results']:
+    b = before.get((r['graph'], r['stage']))
+    if b is None:
+      continue
+
+    slower = max(r['time'], b['time']) >= seconds and r['time'] > threshold * b['time']
+    larger = max(r['memory'], b['memory']) >= memory and r['memory'] > threshold * b['memory']
+
+    if slower or larger:
+      flagged.append({'graph': r['graph'], 'stage': r['stage'], 'time': (b['time'], r['time']), 'memory': (b['memory'], r['memory'])})
+
+  return flagged
+
+if __name__ == '__main__':
+
+  # Runs benchmark and compares it with baseline given as argument
+
+  current = benchmark()
+
+  with open('benchmark.json', 'w') as file:
+    json.dump(current, file, indent = 2)
+
+  if len(sys.argv) > 1:
+    with open(sys.argv[1]) as file:
+      baseline = json.load(file)
+
+    flagged = regressions(current, baseline)
+    print("{0:>15s} | {1:,d} stages".format('Regressions', len(flagged)))
+
+    for r in flagged:
+      print("{0:>15s} | '{1:s}' {2:.3f} -> {3:.3f} sec ({4:,.1f} -> {5:,.1f} MB)".format(r['stage'], r['graph'], *r['time'], *(x / 2**20 for x in r['memory'])))
@@ -0,0 +1,282 @@
+import heapq
+
+import numpy as np
+from scipy.sparse import csgraph
+
+from parallel import pmap, workers_count
+from paths import _ranges, _counts
+from ranking import top_k
+from instrument import timed
+
+_graph = None
+
+def _init(indptr, indices):
+  """
+  Share CSR adjacency with worker process.
+  """
+
+  global _graph
+  _graph = (np.asarray(indptr), np.asarray(indices))
+
+def brandes(indptr, indices, s):
+  """
+  Run level-synchronous BFS from source s and accumulate Brandes dependencies.
+
+  Returns distances of nodes from s with -1 for unreachable nodes and
+  dependencies of s on all other nodes, where each level of the BFS and of
+  the backward accumulation is processed with vectorized bincounts.
+  """
+
+  n = len(indptr) - 1
+  sizes = np.diff(indptr)
+
+  dist = np.full(n, -1, dtype = np.int32)
+  sigma = np.zeros(n)
+  dist[s], sigma[s] = 0, 1.0
+
+  frontier = np.array([s])
+  levels = []
+
+  d = 0
+  while len(frontier) > 0:
+    ends = np.repeat(frontier, sizes[frontier])
+    nbrs = indices[_ranges(indptr[frontier], sizes[frontier])]
+
+    dag = dist[nbrs] < 0
+    u, v = ends[dag], nbrs[dag]
+
+    dist[v] = d + 1
+    frontier = np.flatnonzero(dist == d + 1)
+
+    sigma += np.bincount(v, weights = sigma[u], minlength = n)
+    levels.append((u, v))
+
+    d += 1
+
+  delta = np.zeros(n)
+  for u, v in reversed(levels):
+    delta += np.bincount(u, weights = sigma[u] / sigma[v] * (1 + delta[v]), minlength = n)
+  delta[s] = 0
+
+  return dist, delta
+
+def _block(sources):
+  """
+  Accumulate partial sums of distance centralities over block of sources in worker process.
+  """
+
+  indptr, indices = _graph
+  n = len(indptr) - 1
+
+  total, reach, harmonic, betweenness = np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n)
+  for s in sources:
+    dist, delta = brandes(indptr, indices, s)
+
+    reached = dist > 0
+    total[s] = dist[reached].sum()
+    reach[s] = np.count_nonzero(reached)
+    harmonic[s] = (1 / dist[reached]).sum()
+
+    betweenness += delta
+
+  return total, reach, harmonic, betweenness
+
+@timed('distances')
+def distance_centralities(G, workers = None, sources = None, betweenness = True):
+  """
+  Compute closeness, harmonic and betweenness centralities of nodes of undirected graph G.
+
+  All three are derived from a single BFS per source over the compact graph,
+  ignoring parallel edges. Sources are split into blocks processed by worker
+  processes whose partial sums are reduced at the end. Closeness and
+  betweenness are normalized as in NetworkX, while harmonic is not. With
+  sources, only those are traversed and betweenness is rescaled accordingly.
+  Without betweenness, closeness and harmonic follow from bit-parallel BFS.
+  """
+
+  n = len(G)
+  sources = np.arange(n) if sources is None else np.asarray(sources)
+
+  if not betweenness:
+    counts = _counts(G, sources, workers)
+    ds = np.arange(len(counts))
+
+    total, reach, harmonic = np.zeros(n), np.zeros(n), np.zeros(n)
+    total[sources] = ds @ counts
+    reach[sources] = counts[1:].sum(axis = 0)
+    harmonic[sources] = (1 / ds[1:]) @ counts[1:]
+
+    closeness = np.zeros(n)
+    np.divide(reach * reach, total * (n - 1), out = closeness, where = total > 0)
+
+    return {'closeness': closeness, 'harmonic': harmonic}
+
+  chunks = 4 * workers_count(workers, len(sources))
+  blocks = [block for block in np.array_split(sources, chunks) if len(block) > 0]
+
+  total, reach, harmonic, betweenness = (sum(parts) for parts in zip(*pmap(_block, blocks, workers, _init, (G.indptr, G.indices))))
+
+  closeness = np.zeros(n)
+  np.divide(reach * reach, total * (n - 1), out = closeness, where = total > 0)
+
+  betweenness = betweenness / ((n - 1) * (n - 2)) * n / len(sources) if n > 2 else betweenness
+
+  return {'closeness': closeness, 'harmonic': harmonic, 'betweenness': betweenness}
+
+def _pivots(sources):
+  """
+  Accumulate sums and squared sums of dependencies over block of pivots in worker process.
+  """
+
+  indptr, indices = _graph
+  n = len(indptr) - 1
+
+  total, squares = np.zeros(n), np.zeros(n)
+  for s in sources:
+    _, delta = brandes(indptr, indices, s)
+
+    total += delta
+    squares += delta * delta
+
+  return total, squares
+
+@timed('betweenness')
+def approx_betweenness(G, eps = 0.02, delta = 0.1, k = None, workers = None, seed = None):
+  """
+  Estimate betweenness centralities of nodes of undirected graph G by pivot sampling.
+
+  Pivots are sampled uniformly in rounds of doubling size, and after each
+  round empirical Bernstein bounds give confidence radii of estimates that
+  hold simultaneously with probability 1 - delta. Sampling stops once all
+  radii are below eps, or with k once the confidence interval of each of the
+  top k nodes lies above the intervals of all nodes ranked below it, so the
+  order of the top k nodes is certified. Falls back to exact betweenness
+  once the number of pivots projected from radii and required separations
+  reaches the number of nodes.
+  """
+
+  n = len(G)
+  batch = size = max(64, 8 * workers_count(workers))
+
+  if n <= 2 * size:
+    return {'betweenness': distance_centralities(G, workers)['betweenness'], 'radius': np.zeros(n), 'samples': n, 'exact': True}
+
+  rng = np.random.default_rng(seed)
+
+  c = n / (n - 1)
+  scale = n / ((n - 1) * (n - 2))
+  limit = int(np.ceil(c * c * np.log(2 * n / delta) / (2 * eps * eps)))
+
+  total, squares = np.zeros(n), np.zeros(n)
+  samples, rounds = 0, 0
+
+  while True:
+    pivots = rng.integers(n, size = size)
+    blocks = [block for block in np.array_split(pivots, 4 * workers_count(workers, size)) if len(block) > 0]
+
+    for t, q in pmap(_pivots, blocks, workers, _init, (G.indptr, G.indices)):
+      total += scale * t
+      squares += scale * scale * q
+
+    samples += size
+    rounds += 1
+
+    means = total / samples
+    variances = np.maximum(squares - samples * means * means, 0) / (samples - 1)
+
+    log = np.log(4 * n * 2**rounds / delta)
+    radius = np.minimum(np.sqrt(2 * variances * log / samples) + 7 * c * log / (3 * (samples - 1)), c * np.sqrt(log / (2 * samples)))
+
+    pending, target = radius > eps, np.full(n, eps)
+    if k is not None:
+      order = np.argsort(-means)
+      below = np.append(np.maximum.accumulate((means + radius)[order][::-1])[::-1][1:], -np.inf)
+
+      pending = np.zeros(n, dtype = bool)
+      pending[order[:k]] = ((means - radius)[order] < below)[:k]
+      target[order[:k]] = (means[order[:k]] - means[order[1:k + 1]]) / 2
+
+    if not np.any(pending) or k is None and samples >= limit:
+      break
+
+    with np.errstate(divide = 'ignore'):
+      ratio = radius[pending] / target[pending]
+    need = samples * np.max(np.maximum(ratio**2, ratio))
+
+    if (need if k is not None else min(need, limit)) >= n:
+      return {'betweenness': distance_centralities(G, workers)['betweenness'], 'radius': np.zeros(n), 'samples': n, 'exact': True}
+
+    size = max(batch, min(samples, int(need) - samples + 1))
+
+  return {'betweenness': means, 'radius': radius, 'samples': samples, 'exact': False}
+
+@timed('closeness')
+def top_closeness(G, k = 15, degrees = None):
+  """
+  Compute closeness centralities of nodes of undirected graph G that can rank among the top k.
+
+  Closeness of each node is first bounded from above by assuming that all
+  nodes of its component that are not within two steps are exactly at
+  distance three. Sources are traversed in order of decreasing bound with
+  level-synchronous BFS, where after each level unreached nodes are at least
+  one level further and at most as many as there are edges leaving the last
+  level are exactly one level further, which tightens the bound. BFS is abandoned once the
+  bound falls below the k-th highest closeness found so far, and traversal
+  stops once this holds for all remaining sources. Returns closeness
+  normalized as in NetworkX with zeros for pruned nodes, and indices of top
+  k nodes ranked with degrees as in top_k.
+  """
+
+  n = len(G)
+  indptr, indices = np.asarray(G.indptr), np.asarray(G.indices)
+  sizes = np.diff(indptr)
+  degrees = G.degree if degrees is None else np.asarray(degrees)
+
+  _, components = csgraph.connected_components(G.adjacency(), directed = False)
+  reach = (np.bincount(components) - 1)[components]
+
+  ones = np.minimum(sizes, reach)
+  twos = np.minimum(G.adjacency(multi = False) @ sizes - sizes, reach - ones).clip(0)
+  bounds = np.zeros(n)
+  np.divide(reach * reach, (n - 1) * (3 * reach - 2 * ones - twos), out = bounds, where = reach > 0)
+
+  closeness = np.zeros(n)
+  best = []
+
+  seen, first = np.full(n, -1, dtype = np.int64), np.zeros(n, dtype = np.int64)
+  for s in np.lexsort((np.arange(n), -degrees, -bounds)).tolist():
+    r = reach[s]
+    kth = best[0] if len(best) == k else 0.0
+
+    if r == 0 or bounds[s] < kth:
+      break
+
+    frontier = np.array([s])
+    seen[s] = s
+    total, reached, d = 0, 0, 0
+
+    while len(frontier) > 0:
+      nbrs = indices[_ranges(indptr[frontier], sizes[frontier])]
+      nbrs = nbrs[seen[nbrs] != s]
+
+      first[nbrs] = np.arange(len(nbrs))
+      nbrs = nbrs[first[nbrs] == np.arange(len(nbrs))]
+      seen[nbrs] = s
+
+      d += 1
+      total += d * len(nbrs)
+      reached += len(nbrs)
+      frontier = nbrs
+
+      following = min(r - reached, sizes[frontier].sum() - len(frontier))
+      if reached < r and r * r / ((n - 1) * (total + (d + 1) * following + (d + 2) * (r - reached - following))) < kth:
+        break
+    else:
+      closeness[s] = r * r / ((n - 1) * total)
+
+      if len(best) < k:
+        heapq.heappush(best, closeness[s])
+      elif closeness[s] > best[0]:
+        heapq.heapreplace(best, closeness[s])
+
+  return {'closeness': closeness, 'top': top_k(closeness, degrees, G.labels, k)}
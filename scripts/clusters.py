@@ -0,0 +1,150 @@
+import pickle
+import random
+import multiprocessing as mp
+from time import *
+
+import numpy as np
+
+from cdlib.classes import NodeClustering
+
+from graph import from_networkx
+from parallel import pmap
+from scores import partition, modularity, nmi
+from propagation import label_propagation
+from instrument import timed
+
+COMPACT = (label_propagation,)
+
+_task = None
+
+def known_clusters(G):
+  """
+  Construct clustering of undirected multigraph G from node attribute 'cluster'.
+  """
+
+  clusters = {}
+  for i, data in G.nodes(data = True):
+    c = data['cluster'] if 'cluster' in data else 0
+
+    if c in clusters:
+      clusters[c].append(i)
+    else:
+      clusters[c] = [i]
+
+  return NodeClustering(list(clusters.values()), G, 'known')
+
+def _init(G, C, alg, A, index, known):
+  """
+  Share graph, its compact graph, algorithm, adjacency and known labels with worker process.
+  """
+
+  global _task
+  _task = (G, C, alg, A, index, known)
+
+def _run(args):
+  """
+  Run algorithm once with specified seed and score found clustering in worker process.
+  """
+
+  seed, keep = args
+  G, C, alg, A, index, known = _task
+
+  random.seed(seed)
+  np.random.seed(seed % 2**32)
+
+  tic = time()
+
+  comms = alg(C, graph = G) if alg in COMPACT else alg(G)
+
+  t = time() - tic
+
+  labels = partition(comms.communities, index)
+
+  scores = (t, len(comms.communities), max(len(comm) for comm in comms.communities), modularity(A, labels), nmi(known, labels))
+
+  return scores, comms.communities if keep else None
+
+def replicate(G, alg, k = 100, workers = None, seed = None):
+  """
+  Run community detection algorithm k times on undirected multigraph G in parallel.
+
+  Graph and algorithm are shipped to each worker process once, while runs
+  receive independent seeds. Returns dictionary of arrays with times, numbers
+  of clusters, sizes of largest clusters, modularities Q and NMI with known
+  clustering for all runs, and clusters found in the last run. Scores are
+  computed from label arrays on the multigraph adjacency, while algorithms in
+  COMPACT run on compact graph converted once. Where processes cannot be
+  forked, algorithms such as lambdas that cannot be pickled run serially.
+  """
+
+  C = from_networkx(G)
+  index = {i: j for j, i in enumerate(G.nodes())}
+
+  if 'fork' not in mp.get_all_start_methods():
+    try:
+      pickle.dumps(alg)
+    except (pickle.PicklingError, AttributeError, TypeError):
+      workers = 1
+
+  seeds = np.random.SeedSequence(seed).generate_state(k).tolist()
+  results = pmap(_run, [(s, r == k - 1) for r, s in enumerate(seeds)], workers, _init, (G, C, alg, C.adjacency(), index, C.clusters))
+
+  runs = np.array([scores for scores, _ in results])
+
+  return {'time': runs[:, 0], 'clusters': runs[:, 1], 'largest': runs[:, 2], 'Q': runs[:, 3], 'NMI': runs[:, 4], 'communities': results[-1][1]}
+
+@timed('clusters')
+def clusters_info(G, alg, label, k = 100, workers = None):
+  """
+  Find and print out standard statistics of clusters of undirected multigraph G.
+  """
+
+  print("{0:>15s} | '{1:s}'".format('Graph', G.name.replace('_', '-')))
+  print("{0:>15s} | '{1:s}' ({2:d}x)".format('Algorithm', label, k))
+
+  runs = replicate(G, alg, k, workers)
+
+  c, C = runs['clusters'].mean(), runs['largest'].mean()
+
+  print("{0:>15s} | {1:,.1f} x {2:,.0f} ({3:.1f}%)".format('Clusters', c, len(G) / c, 100 * C / len(G)))
+
+  print("{0:>15s} | {1:.3f} ({2:.3f})".format('Q', runs['Q'].mean(), runs['Q'].std(ddof = 1)))
+
+  print("{0:>15s} | {1:.3f} ({2:.3f})".format('NMI', runs['NMI'].mean(), runs['NMI'].std(ddof = 1)))
+
+  print("{0:>15s} | {1:.1f} sec ({2:.1f})\n".format('Time', runs['time'].mean(), runs['time'].std(ddof = 1)))
+
+  return NodeClustering(runs['communities'], G, label)
+
+def block_model(G, comms, pixels = 1000):
+  """
+  Rasterize adjacency matrix of undirected multigraph G permuted by clusters into density image.
+
+  Nodes are ordered by clusters and the sparse adjacency is binned straight
+  into an image of at most pixels x pixels cells, where each cell holds the
+  density of edges among nodes it aggregates, so memory is proportional to
+  the number of edges rather than the squared number of nodes. Returns
+  image, ordered nodes and cluster boundaries in image coordinates.
+  """
+
+  C = from_networkx(G)
+  nodes = list(G.nodes()) if G is not C else C.labels.tolist()
+  index = {i: j for j, i in enumerate(nodes)}
+
+  n = len(C)
+  bins = min(n, pixels)
+
+  order = np.argsort(partition(comms.communities, index), kind = 'stable')
+  position = np.empty(n, dtype = np.int64)
+  position[order] = np.arange(n)
+
+  cell = position * bins // n
+  A = C.adjacency().tocoo()
+
+  image = np.bincount(cell[A.row] * bins + cell[A.col], weights = A.data, minlength = bins * bins).reshape(bins, bins)
+  sizes = np.bincount(cell, minlength = bins)
+  image /= np.outer(sizes, sizes)
+
+  bounds = np.cumsum([len(comm) for comm in comms.communities[:-1]]) * bins / n - 0.5
+
+  return image, [nodes[i] for i in order.tolist()], bounds
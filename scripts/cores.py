@@ -0,0 +1,110 @@
+import numpy as np
+
+from paths import _ranges
+from instrument import timed
+
+def degrees(G, multi = True):
+  """
+  Degrees of nodes of compact graph G ignoring self-loops and optionally parallel edges.
+  """
+
+  rows = np.repeat(np.arange(len(G)), np.diff(G.indptr))
+  weights = np.where(G.indices == rows, 0, G.mult if multi else 1)
+
+  return np.bincount(rows, weights = weights, minlength = len(G)).astype(np.int64)
+
+@timed('cores')
+def core_numbers(G, multi = True):
+  """
+  Compute core numbers of nodes of compact graph G with Batagelj-Zaversnik algorithm.
+
+  Nodes are kept in an array sorted by current degree with bucket offsets, so
+  removing the node of minimum degree and decrementing degrees of its
+  neighbors are constant time swaps. With multi, parallel edges count towards
+  degrees and each decrement is repeated for every parallel edge, which keeps
+  the total time linear in the number of edges. Self-loops are ignored.
+  """
+
+  n = len(G)
+  deg = degrees(G, multi)
+
+  indptr, indices = G.indptr.tolist(), G.indices.tolist()
+  mult = G.mult.tolist() if multi else [1] * len(indices)
+
+  vert = np.argsort(deg, kind = 'stable')
+  pos = np.empty(n, dtype = np.int64)
+  pos[vert] = np.arange(n)
+
+  start = np.zeros(deg.max() + 2 if n > 0 else 1, dtype = np.int64)
+  np.cumsum(np.bincount(deg, minlength = len(start) - 1), out = start[1:])
+
+  deg, vert, pos, start = deg.tolist(), vert.tolist(), pos.tolist(), start.tolist()
+
+  for i in range(n):
+    v = vert[i]
+    dv = deg[v]
+    for j in range(indptr[v], indptr[v + 1]):
+      u = indices[j]
+      for _ in range(min(mult[j], deg[u] - dv)):
+        du = deg[u]
+        pu, pw = pos[u], start[du]
+        w = vert[pw]
+        if u != w:
+          vert[pu], vert[pw] = w, u
+          pos[u], pos[w] = pw, pu
+        start[du] += 1
+        deg[u] = du - 1
+
+  return np.array(deg, dtype = np.int64)
+
+@timed('onion')
+def onion_layers(G, multi = True):
+  """
+  Compute core numbers and onion layers of nodes of compact graph G.
+
+  Nodes of degree at most the current core number are peeled off together,
+  where each such round forms one onion layer numbered from 1 upwards and
+  degrees of neighbors are updated with a vectorized bincount.
+  """
+
+  n = len(G)
+  deg = degrees(G, multi)
+  sizes = np.diff(G.indptr)
+
+  alive = np.ones(n, dtype = bool)
+  cores = np.zeros(n, dtype = np.int64)
+  layers = np.zeros(n, dtype = np.int64)
+
+  k, layer = 0, 0
+  while alive.any():
+    k = max(k, deg[alive].min())
+
+    peel = np.flatnonzero(alive & (deg <= k))
+    while len(peel) > 0:
+      layer += 1
+      cores[peel], layers[peel] = k, layer
+      alive[peel] = False
+
+      ranges = _ranges(G.indptr[peel], sizes[peel])
+      deg -= np.bincount(G.indices[ranges], weights = G.mult[ranges] if multi else None, minlength = n).astype(np.int64)
+
+      peel = np.flatnonzero(alive & (deg <= k))
+
+  return cores, layers
+
+def k_shell(cores, k):
+  """
+  Indices of nodes in k-shell with core number exactly k.
+  """
+
+  return np.flatnonzero(cores == k)
+
+def k_core(cores, k = None):
+  """
+  Indices of nodes in k-core or main core if k is None, from core numbers of nodes.
+
+  Together with the subgraph view of a NetworkX graph, this extracts any
+  k-core without copying the graph.
+  """
+
+  return np.flatnonzero(cores >= (cores.max() if k is None else k))
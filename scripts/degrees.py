@@ -0,0 +1,153 @@
+import numpy as np
+
+from graph import from_networkx
+from instrument import timed
+
+CANDIDATES = 2**22
+
+def histogram(degrees):
+  """
+  Fractions of nodes p_k with degree k = 0, ..., k_max.
+  """
+
+  degrees = np.asarray(degrees, dtype = np.int64)
+
+  return np.bincount(degrees) / len(degrees)
+
+def log_binning(degrees, bins = 20):
+  """
+  Logarithmically binned degree distribution of nodes with positive degrees.
+
+  Degrees are split into bins of exponentially growing width, where counts
+  are divided by the number of integer degrees in each bin. Returns
+  geometric centers of non-empty bins and densities p_k at centers.
+  """
+
+  degrees = np.asarray(degrees, dtype = np.int64)
+  degrees = degrees[degrees > 0]
+
+  edges = np.unique(np.floor(np.geomspace(1, degrees.max() + 1, bins + 1)).astype(np.int64))
+  counts = np.histogram(degrees, edges)[0]
+
+  centers = np.sqrt(edges[:-1] * (edges[1:] - 1))
+  density = counts / np.diff(edges) / len(degrees)
+
+  return centers[counts > 0], density[counts > 0]
+
+def ccdf(degrees):
+  """
+  Complementary cumulative degree distribution P(K >= k) at distinct degrees k of nodes.
+  """
+
+  counts = np.bincount(np.asarray(degrees, dtype = np.int64))
+  ks = np.flatnonzero(counts)
+
+  return ks, np.cumsum(counts[::-1])[::-1][ks] / counts.sum()
+
+def power_law(degrees, kmin = None, tail = 10):
+  """
+  Fit power-law degree distribution p_k ~ k^-alpha by maximum likelihood.
+
+  Exponent alpha is estimated with the discrete approximation of Clauset,
+  Shalizi and Newman for degrees at least kmin. Unless kmin is given, it is
+  chosen among distinct degrees with at least tail nodes above them to
+  minimize Kolmogorov-Smirnov distance D between empirical and fitted CCDF.
+  All candidates are scored together from suffix sums of sorted degrees and
+  blocks of the candidates by distinct degrees matrix. Returns dictionary with
+  alpha, its standard error, kmin, D, size of tail and arrays of candidate
+  values of kmin with their alpha and D.
+  """
+
+  degrees = np.sort(np.asarray(degrees, dtype = np.int64))
+  degrees = degrees[degrees > 0]
+  n = len(degrees)
+
+  if n == 0:
+    raise ValueError("Power-law fit requires nodes with positive degrees")
+
+  starts = np.flatnonzero(np.diff(degrees, prepend = 0))
+  ks = degrees[starts]
+  sizes = n - starts
+
+  logs = np.concatenate([np.cumsum(np.log(degrees)[::-1])[::-1], [0.0]])
+
+  if kmin is None:
+    candidates = np.flatnonzero(sizes >= min(tail, n))
+  else:
+    candidates = np.flatnonzero(ks >= kmin)[:1]
+    if len(candidates) == 0:
+      raise ValueError("No degrees at least kmin = {:d}".format(kmin))
+
+  alphas = 1 + sizes[candidates] / (logs[starts[candidates]] - sizes[candidates] * np.log(ks[candidates] - 0.5))
+
+  distances = np.zeros(len(candidates))
+  step = max(1, CANDIDATES // len(ks))
+  for lo in range(0, len(candidates), step):
+    block = candidates[lo:lo + step]
+    alpha = alphas[lo:lo + step, np.newaxis]
+
+    empirical = sizes[np.newaxis, :] / sizes[block, np.newaxis]
+    fitted = ((ks[np.newaxis, :] - 0.5) / (ks[block, np.newaxis] - 0.5)) ** (1 - alpha)
+
+    gaps = np.where(np.arange(len(ks))[np.newaxis, :] >= block[:, np.newaxis], np.abs(empirical - fitted), 0.0)
+    distances[lo:lo + step] = gaps.max(axis = 1)
+
+  best = np.argmin(distances)
+  size = int(sizes[candidates[best]])
+
+  return {'alpha': float(alphas[best]), 'sigma': float((alphas[best] - 1) / np.sqrt(size)), 'kmin': int(ks[candidates[best]]), 'D': float(distances[best]), 'tail': size, 'kmins': ks[candidates], 'alphas': alphas, 'distances': distances}
+
+def plot_degrees(degrees, fit = None, name = None, bins = 20):
+  """
+  Plot raw and logarithmically binned degree distribution and CCDF with optional power-law fit.
+
+  Matplotlib is imported only when plotting.
+  """
+
+  import matplotlib.pyplot as plt
+
+  pk = histogram(degrees)
+  ks = np.flatnonzero(pk)
+
+  fig, (left, right) = plt.subplots(1, 2, figsize = (10, 4))
+
+  left.loglog(ks[ks > 0], pk[ks[ks > 0]], '*k', alpha = 0.3)
+  left.loglog(*log_binning(degrees, bins), 'o-r')
+  left.set_ylabel('Fraction of nodes')
+  left.set_xlabel('Node degree')
+
+  right.loglog(*ccdf(degrees[degrees > 0]), '.k')
+  if fit is not None:
+    x = np.geomspace(fit['kmin'], degrees.max(), 50)
+    right.loglog(x, fit['tail'] / np.count_nonzero(degrees > 0) * ((x - 0.5) / (fit['kmin'] - 0.5)) ** (1 - fit['alpha']), '--r')
+  right.set_ylabel('Fraction of nodes with larger degree')
+  right.set_xlabel('Node degree')
+
+  if name is not None:
+    fig.suptitle(name)
+  plt.show()
+
+@timed('degrees')
+def degree_info(G, plot = False, bins = 20):
+  """
+  Compute and print out degree distribution of undirected multigraph G with power-law fit.
+
+  Returns dictionary of degrees, histogram, binned distribution, CCDF and fit,
+  while distributions are only plotted on request.
+  """
+
+  G = from_networkx(G)
+  degrees = np.asarray(G.degree)
+
+  info = {'degrees': degrees, 'histogram': histogram(degrees), 'binned': log_binning(degrees, bins), 'ccdf': ccdf(degrees), 'fit': power_law(degrees)}
+  fit = info['fit']
+
+  print("{0:>15s} | '{1:s}'".format('Graph', G.name.replace('_', '-')))
+  print("{0:>15s} | {1:.2f} ({2:.2f})".format('Power-law', fit['alpha'], fit['sigma']))
+  print("{0:>15s} | {1:,d} ({2:.1f}%)".format('k-min', fit['kmin'], 100 * fit['tail'] / len(degrees)))
+  print("{0:>15s} | {1:.4f}\n".format('KS', fit['D']))
+
+  if plot:
+    plot_degrees(degrees, fit, G.name, bins)
+
+  return info
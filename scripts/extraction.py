@@ -0,0 +1,143 @@
+from time import *
+
+import numpy as np
+
+from cdlib import algorithms
+
+from graph import from_networkx
+from parallel import pmap
+from spectral import Spectral
+from centrality import distance_centralities
+from triangles import clustering
+from cores import core_numbers
+from scores import partition
+from instrument import timed
+
+def _degrees(G, inputs, workers):
+  """
+  Degrees of nodes of compact graph G without parallel edges counting self-loops twice.
+  """
+
+  return G.view(multi = False).degree
+
+def _communities(alg):
+  """
+  Stage of community labels of nodes found by cdlib algorithm on NetworkX graph.
+  """
+
+  return lambda G, inputs, workers: partition(alg(inputs['networkx']).communities, G.index)
+
+SHARED = {
+  'spectral': lambda G: Spectral(G),
+  'networkx': lambda G: G.to_networkx(multi = False)
+}
+
+STAGES = {
+  'degrees': ((), _degrees),
+  'distances': ((), lambda G, inputs, workers: distance_centralities(G, workers)),
+  'triangles': ((), lambda G, inputs, workers: clustering(G, workers)),
+  'degree': (('degrees',), lambda G, inputs, workers: inputs['degrees'] / (len(G) - 1)),
+  'pagerank': (('spectral',), lambda G, inputs, workers: inputs['spectral'].pagerank()),
+  'eigenvector': (('spectral',), lambda G, inputs, workers: inputs['spectral'].eigenvector()),
+  'clustering': (('triangles',), lambda G, inputs, workers: inputs['triangles']['clustering']),
+  'μ-clustering': (('triangles',), lambda G, inputs, workers: inputs['triangles']['mu']),
+  'closeness': (('distances',), lambda G, inputs, workers: inputs['distances']['closeness']),
+  'harmonic': (('distances',), lambda G, inputs, workers: inputs['distances']['harmonic']),
+  'betweenness': (('distances',), lambda G, inputs, workers: inputs['distances']['betweenness']),
+  'core': ((), lambda G, inputs, workers: core_numbers(G)),
+  'leiden': (('networkx',), _communities(algorithms.leiden)),
+  'infomap': (('networkx',), _communities(algorithms.infomap)),
+  'louvain': (('networkx',), _communities(algorithms.louvain))
+}
+
+DISCRETE = {'core', 'leiden', 'infomap', 'louvain'}
+
+HEAVY = {'distances', 'triangles'}
+
+_graph, _shared = None, {}
+
+def _init(G, shared):
+  """
+  Share compact graph and objects built from it such as spectral operators with worker process.
+  """
+
+  global _graph, _shared
+  _graph, _shared = G, shared
+
+def _stage(args):
+  """
+  Compute stage from results of its dependencies in worker process.
+  """
+
+  name, inputs, workers = args
+  deps, func = STAGES[name]
+
+  tic = time()
+  result = func(_graph, dict(_shared, **inputs), workers)
+
+  return result, time() - tic
+
+@timed('extract')
+def extract(G, features, workers = None):
+  """
+  Compute node features of undirected multigraph G together on its compact graph.
+
+  Features and the shared stages they depend on, such as BFS and triangle
+  counting, form a dependency graph that is executed in rounds. Light
+  stages whose dependencies are met run concurrently in worker processes,
+  or with all workers when only one is ready, while heavy stages such as BFS
+  for distance centralities follow one at a time with all workers, so each
+  shared stage is computed once. Objects such as spectral operators and
+  NetworkX graph are built once before workers are forked, so that only
+  arrays are sent between processes. Returns matrix with aligned column for
+  each feature, names of features and timings of stages.
+  """
+
+  G = from_networkx(G)
+
+  for name in features:
+    if name not in STAGES:
+      raise ValueError("Unknown node feature '{:s}'".format(name))
+
+  needed, stack = set(), list(features)
+  while stack:
+    name = stack.pop()
+    if name not in needed:
+      needed.add(name)
+      stack.extend(STAGES[name][0] if name in STAGES else ())
+
+  shared, times = {}, {}
+  for name in sorted(needed & set(SHARED)):
+    tic = time()
+    shared[name] = SHARED[name](G)
+    times[name] = time() - tic
+
+  results = {}
+  while len(results) < len(needed - set(shared)):
+    ready = [name for name in sorted(needed - set(shared) - set(results)) if all(dep in results or dep in shared for dep in STAGES[name][0])]
+    light = [name for name in ready if name not in HEAVY]
+
+    rounds = [light] if len(light) > 0 else []
+    rounds.extend([name] for name in ready if name in HEAVY)
+
+    for names in rounds:
+      tasks = [(name, {dep: results[dep] for dep in STAGES[name][0] if dep in results}, workers if len(names) == 1 else 1) for name in names]
+
+      for name, (result, t) in zip(names, pmap(_stage, tasks, workers, _init, (G, shared))):
+        results[name], times[name] = result, t
+
+  return np.column_stack([results[name] for name in features]).astype(float), list(features), times
+
+def feature_table(G, X, names):
+  """
+  Construct table of Orange headers and columns of node features with node labels and classes.
+  """
+
+  G = from_networkx(G)
+
+  table = {'m#node': G.labels}
+  for j, name in enumerate(names):
+    table[('D#' if name in DISCRETE else 'C#') + name] = X[:, j].astype(np.int64) if name in DISCRETE else X[:, j]
+  table['cD#class'] = G.clusters
+
+  return table
@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+
+from instrument import timed
+
+def columns(table):
+  """
+  Expand table of Orange headers and arrays into list of headers and one-dimensional columns.
+
+  Matrices such as embeddings are expanded into one column per dimension,
+  where header 'C#node2vec' gives columns 'C#node2vec-0', 'C#node2vec-1' etc.
+  """
+
+  headers, cols = [], []
+  for header, values in table.items():
+    values = np.asarray(values)
+    if values.ndim == 1:
+      headers.append(header)
+      cols.append(values)
+    else:
+      headers.extend('{:s}-{:d}'.format(header, j) for j in range(values.shape[1]))
+      cols.extend(values.T)
+
+  return headers, cols
+
+def _format(values):
+  """
+  Printf format of column by its type.
+
+  Double precision values are written with six decimals, while single
+  precision values such as embeddings are written with nine significant
+  digits that recover them exactly.
+  """
+
+  if values.dtype == np.float32:
+    return '%.9g'
+  elif values.dtype.kind == 'f':
+    return '%f'
+  elif values.dtype.kind in 'iub':
+    return '%d'
+
+  return '%s'
+
+@timed('export')
+def write_features(file, table, path = '.'):
+  """
+  Write table of node features given by Orange headers and arrays to file in path.
+
+  Format follows from extension of file. Tab-separated '.tab' files keep
+  Orange headers such as 'm#node', 'C#degree' and 'cD#class', and are
+  written in bulk with one format operation per row. Binary '.npz' files
+  store each array under its header, '.npy' files store structured array
+  with a field for each header, and '.parquet' files store expanded columns
+  and require PyArrow.
+  """
+
+  file = os.path.join(path, file)
+  ext = os.path.splitext(file)[1]
+
+  if ext == '.tab':
+    headers, cols = columns(table)
+    line = '\t'.join(_format(values) for values in cols) + '\n'
+
+    with open(file, 'w') as out:
+      out.write('\t'.join(headers) + '\n')
+      out.writelines(line % row for row in zip(*(values.tolist() for values in cols)))
+
+  elif ext == '.npz':
+    np.savez(file, **{header: np.asarray(values) for header, values in table.items()})
+
+  elif ext == '.npy':
+    arrays = [np.asarray(values) for values in table.values()]
+    records = np.empty(len(arrays[0]), dtype = [(header, values.dtype, values.shape[1:]) for header, values in zip(table, arrays)])
+    for header, values in zip(table, arrays):
+      records[header] = values
+
+    np.save(file, records)
+
+  elif ext == '.parquet':
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    headers, cols = columns(table)
+    pq.write_table(pa.table(dict(zip(headers, cols))), file)
+
+  else:
+    raise ValueError("Unknown feature file format '{:s}'".format(ext))
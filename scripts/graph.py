@@ -0,0 +1,199 @@
+import copy
+
+import numpy as np
+import scipy.sparse as sp
+
+import networkx as nx
+
+class Graph:
+  """
+  Compact undirected multigraph with integer-indexed nodes in CSR form.
+
+  Nodes are integers 0, ..., n - 1 with string labels and integer clusters,
+  while each distinct edge is kept once in arrays of sources and targets with
+  the number of its parallel edges in multiplicity. Adjacency is stored in
+  CSR form with offsets indptr and sorted neighbors indices, where each
+  neighbor is listed once and mult holds the number of parallel edges. Edges
+  given with repetitions are collapsed, while any precomputed distinct edges
+  with multiplicity and adjacency (indptr, indices, mult) can be passed in
+  directly. Simple view of the graph shares all arrays and sees each
+  multiplicity as one.
+  """
+
+  def __init__(self, name, labels, clusters, sources, targets, adjacency = None, multiplicity = None):
+    self.name = name
+
+    self.labels = np.asarray(labels, dtype = str)
+    self.clusters = np.asarray(clusters, dtype = np.int64)
+
+    n = len(self.labels)
+    if multiplicity is None:
+      sources, targets, multiplicity = collapse(n, sources, targets)
+
+    self.sources = np.asarray(sources, dtype = _itype(n))
+    self.targets = np.asarray(targets, dtype = _itype(n))
+    self.multiplicity = np.asarray(multiplicity, dtype = np.int32)
+
+    if adjacency is None:
+      adjacency = csr(n, self.sources, self.targets, self.multiplicity)
+    self.indptr, self.indices, self.mult = adjacency
+
+    self.multigraph = True
+    self._base = self
+
+    self._degree = None
+    self._index = None
+
+  def __len__(self):
+    return len(self.labels)
+
+  def number_of_nodes(self):
+    return len(self.labels)
+
+  def number_of_edges(self):
+    return int(self.multiplicity.sum()) if self.multigraph else len(self.sources)
+
+  def view(self, multi = True):
+    """
+    Multigraph or simple view of graph sharing its arrays.
+
+    In simple view, mult and multiplicity are read-only arrays of ones that
+    take no memory, so algorithms on either view need no copy of the graph.
+    """
+
+    base = self._base
+    if multi:
+      return base
+
+    G = copy.copy(base)
+    G.multigraph = False
+    G.mult = np.broadcast_to(np.int32(1), base.mult.shape)
+    G.multiplicity = np.broadcast_to(np.int32(1), base.multiplicity.shape)
+    G._degree = None
+
+    return G
+
+  @property
+  def degree(self):
+    """
+    Degrees of nodes counting parallel edges and self-loops twice as in NetworkX.
+    """
+
+    if self._degree is None:
+      n = len(self)
+      weights = self.multiplicity if self.multigraph else None
+      self._degree = (np.bincount(self.sources, weights, minlength = n) + np.bincount(self.targets, weights, minlength = n)).astype(np.int64)
+
+    return self._degree
+
+  @property
+  def index(self):
+    """
+    Dictionary mapping node labels to integer indices.
+    """
+
+    if self._index is None:
+      self._index = {label: i for i, label in enumerate(self.labels.tolist())}
+
+    return self._index
+
+  def neighbors(self, i):
+    """
+    Sorted distinct neighbors of node i.
+    """
+
+    return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+  def edges(self):
+    """
+    Sources and targets of edges with parallel edges repeated, unless graph is simple view.
+    """
+
+    if not self.multigraph or not self.is_multi():
+      return self.sources, self.targets
+
+    return np.repeat(self.sources, self.multiplicity), np.repeat(self.targets, self.multiplicity)
+
+  def adjacency(self, multi = True):
+    """
+    Sparse symmetric adjacency matrix with edge multiplicities or binary entries.
+    """
+
+    n = len(self)
+    data = self.mult if multi and self.multigraph else np.ones(len(self.indices), dtype = np.int32)
+
+    return sp.csr_matrix((data, self.indices, self.indptr), shape = (n, n))
+
+  def is_multi(self):
+    """
+    Check whether graph contains parallel edges.
+    """
+
+    return self.multigraph and bool(np.any(self.multiplicity > 1))
+
+  def to_networkx(self, multi = True):
+    """
+    Construct NetworkX multigraph or simple graph with attribute 'cluster'.
+    """
+
+    G = nx.MultiGraph(name = self.name) if multi else nx.Graph(name = self.name)
+
+    labels = self.labels.tolist()
+    G.add_nodes_from((label, {'cluster': c}) for label, c in zip(labels, self.clusters.tolist()))
+
+    sources, targets = self.edges() if multi else (self.sources, self.targets)
+    G.add_edges_from(zip(self.labels[sources].tolist(), self.labels[targets].tolist()))
+
+    return G
+
+def from_networkx(G):
+  """
+  Construct compact graph from NetworkX graph G with node attribute 'cluster'.
+  """
+
+  if isinstance(G, Graph):
+    return G
+
+  index = {i: j for j, i in enumerate(G.nodes())}
+  edges = np.array([(index[i], index[j]) for i, j in G.edges()], dtype = np.int64).reshape(-1, 2)
+
+  return Graph(G.name, [str(i) for i in G.nodes()], [data.get('cluster', 0) for _, data in G.nodes(data = True)], edges[:, 0], edges[:, 1])
+
+def _itype(n):
+  """
+  Smallest integer type for indexing n nodes.
+  """
+
+  return np.int32 if n < 2**31 else np.int64
+
+def collapse(n, sources, targets):
+  """
+  Collapse edge arrays into distinct edges with sources not above targets and their multiplicities.
+  """
+
+  keys = np.sort(np.minimum(sources, targets).astype(np.int64) * n + np.maximum(sources, targets))
+
+  starts = np.flatnonzero(np.diff(keys, prepend = -1))
+  counts = np.diff(np.append(starts, len(keys)))
+
+  return keys[starts] // n, keys[starts] % n, counts
+
+def csr(n, sources, targets, mult):
+  """
+  Construct symmetric CSR adjacency with edge multiplicities from arrays of distinct edges.
+  """
+
+  u = np.minimum(sources, targets).astype(np.int64)
+  v = np.maximum(sources, targets).astype(np.int64)
+
+  loop = u == v
+  rows = np.concatenate([u, v[~loop]])
+  cols = np.concatenate([v, u[~loop]])
+  mult = np.concatenate([mult, mult[~loop]])
+
+  order = np.argsort(rows * n + cols)
+
+  indptr = np.zeros(n + 1, dtype = np.int64)
+  np.cumsum(np.bincount(rows, minlength = n), out = indptr[1:])
+
+  return indptr, cols[order].astype(_itype(n)), mult[order].astype(np.int32)
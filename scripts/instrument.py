@@ -0,0 +1,232 @@
+import os
+import json
+import atexit
+import functools
+import resource
+import tracemalloc
+from time import *
+from contextlib import contextmanager
+
+_sink = None
+_events = None
+_stack = []
+
+def enable(file = None, memory = False, summary = True):
+  """
+  Enable recording of stages as events appended to JSONL file.
+
+  With memory, peak memory of stages is traced with tracemalloc, which slows
+  down allocation heavy code. With summary, flame-style summary of recorded
+  stages is printed out at exit.
+  """
+
+  global _sink, _events
+  disable()
+
+  _sink = open(file, 'a') if file is not None else None
+  _events = []
+
+  if memory:
+    tracemalloc.start()
+  if summary:
+    atexit.register(flame)
+
+def disable():
+  """
+  Disable recording of stages and close events file.
+  """
+
+  global _sink, _events
+
+  if _sink is not None:
+    _sink.close()
+  if tracemalloc.is_tracing():
+    tracemalloc.stop()
+  atexit.unregister(flame)
+
+  _sink, _events = None, None
+
+def enabled():
+  """
+  Check whether recording of stages is enabled.
+  """
+
+  return _events is not None
+
+def _rss():
+  """
+  Peak resident memory of this process in bytes.
+  """
+
+  return 1024 * resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+@contextmanager
+def stage(name, **size):
+  """
+  Record wall time, CPU time and peak memory of enclosed analysis stage.
+
+  Stages are nested into paths such as 'stats/components', and keyword
+  arguments describe input size such as numbers of nodes and edges. Each
+  finished stage is emitted as one event, while with recording disabled the
+  context manager does nothing else than check a flag. Either way, it yields
+  dictionary of sizes that the enclosed stage may extend.
+  """
+
+  if _events is None:
+    yield size
+    return
+
+  tracing = tracemalloc.is_tracing()
+  if tracing:
+    if _stack:
+      _stack[-1]['peak'] = max(_stack[-1]['peak'], tracemalloc.get_traced_memory()[1])
+    tracemalloc.reset_peak()
+
+  frame = {'name': name, 'peak': 0}
+  _stack.append(frame)
+  path = '/'.join(f['name'] for f in _stack)
+
+  rss = _rss()
+  cpu = process_time()
+  tic = perf_counter()
+
+  try:
+    yield size
+  finally:
+    event = {'stage': path, 'depth': len(_stack) - 1, 'wall': perf_counter() - tic, 'cpu': process_time() - cpu, 'rss': _rss(), 'rss_delta': _rss() - rss}
+
+    _stack.pop()
+    if tracing:
+      event['memory'] = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+      if _stack:
+        _stack[-1]['peak'] = max(_stack[-1]['peak'], event['memory'])
+
+    event.update(size)
+    event['time'] = time()
+
+    _emit(event)
+
+def _emit(event):
+  """
+  Record event and append it to events file.
+  """
+
+  _events.append(event)
+  if _sink is not None:
+    _sink.write(json.dumps(event) + '\n')
+    _sink.flush()
+
+def _size(x):
+  """
+  Input size of graph-like object with numbers of nodes and edges or of array.
+  """
+
+  if hasattr(x, 'number_of_edges'):
+    return {'nodes': x.number_of_nodes(), 'edges': x.number_of_edges()}
+  elif hasattr(x, 'shape'):
+    return {'size': x.shape[0]}
+
+  return {}
+
+def timed(name, size = None):
+  """
+  Decorate function to run as stage with input size taken from its first argument.
+
+  Size is the numbers of nodes and edges of a graph or the length of an
+  array, or dictionary returned by size called with the arguments of the
+  function, such as for methods. When the first argument has no size, such
+  as the path of a loaded file, size is taken from the result.
+  """
+
+  def decorate(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+      if _events is None:
+        return func(*args, **kwargs)
+
+      sizes = size(*args, **kwargs) if size is not None else _size(args[0]) if args else {}
+
+      with stage(name, **sizes) as sizes:
+        result = func(*args, **kwargs)
+        if not sizes:
+          sizes.update(_size(result))
+
+        return result
+
+    return wrapper
+
+  return decorate
+
+def traced(args):
+  """
+  Run func on task in worker process and return its result with events of stages it recorded.
+
+  Worker inherits recording state and current stage when forked, while its
+  events are returned to parent process instead of written to events file.
+  """
+
+  global _sink
+
+  func, task = args
+  if _events is None:
+    return func(task), []
+
+  _sink = None
+  start = len(_events)
+  result = func(task)
+
+  return result, _events[start:]
+
+def merge(records):
+  """
+  Record events of stages sent back from worker process.
+  """
+
+  if _events is not None:
+    for event in records:
+      _emit(event)
+
+def events():
+  """
+  List of events recorded since recording was enabled.
+  """
+
+  return list(_events or [])
+
+def flame(records = None, width = 40):
+  """
+  Print out flame-style summary of stages from recorded events.
+
+  Stages on the same path are aggregated, and each is shown indented under
+  its parent with total wall time, self time excluding nested stages, number
+  of calls and a bar proportional to its share of total time. Returns
+  folded stacks with self times in milliseconds as used by flame graph tools.
+  """
+
+  records = events() if records is None else records
+
+  total, calls, nested = {}, {}, {}
+  for e in records:
+    total[e['stage']] = total.get(e['stage'], 0.0) + e['wall']
+    calls[e['stage']] = calls.get(e['stage'], 0) + 1
+
+    parent = e['stage'].rpartition('/')[0]
+    if parent:
+      nested[parent] = nested.get(parent, 0.0) + e['wall']
+
+  top = sum(t for path, t in total.items() if '/' not in path) or 1.0
+
+  folded = []
+  for path in sorted(total, key = lambda path: path.split('/')):
+    depth = path.count('/')
+    own = total[path] - nested.get(path, 0.0)
+    bar = '#' * int(round(width * total[path] / top))
+
+    print("{0:>15s} | {1:s}{2:s} {3:.3f} sec ({4:.3f} self, {5:,d}x) {6:s}".format('Stage', '  ' * depth, path.rpartition('/')[2], total[path], own, calls[path], bar))
+    folded.append('{:s} {:d}'.format(path.replace('/', ';'), int(round(1000 * own))))
+  print()
+
+  return folded
+
+if os.environ.get('NETPY_EVENTS'):
+  enable(os.environ['NETPY_EVENTS'], memory = bool(os.environ.get('NETPY_MEMORY')))
@@ -0,0 +1,251 @@
+import io
+import contextlib
+
+import numpy as np
+
+from graph import Graph, from_networkx
+from pajek import write_pajek
+from stats import graph_info
+from parallel import pimap
+from instrument import timed
+
+def erdos_renyi(n, m, seed = None):
+  """
+  Sample edges of Erdös-Rényi random graph G(n, m) with n nodes and m distinct edges.
+
+  Node pairs are drawn in bulk and deduplicated until enough distinct pairs
+  are found by sorting, from which a uniformly random subset of m pairs is kept.
+  """
+
+  rng = np.random.default_rng(seed)
+  m = min(int(m), n * (n - 1) // 2)
+
+  keys = np.zeros(0, dtype = np.int64)
+  while len(keys) < m:
+    u, v = rng.integers(n, size = (2, 2 * (m - len(keys)) + 16))
+    keys = np.sort(np.concatenate([keys, (np.minimum(u, v) * n + np.maximum(u, v))[u != v]]))
+    keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+
+  keys = np.sort(rng.permutation(keys)[:m])
+
+  return keys // n, keys % n
+
+def barabasi_albert(n, k, seed = None):
+  """
+  Sample edges of Barabási–Albert scale-free graph with n nodes each attaching with k edges.
+
+  As in NetworkX, node k first links to nodes 0, ..., k - 1, and every next
+  node links to k distinct nodes chosen proportionally to their degrees. The
+  choice is made by picking a uniformly random earlier edge endpoint, where
+  picks of target endpoints are resolved by pointer jumping and repeated
+  targets of the same node are redrawn, so all edges are sampled together.
+  """
+
+  if k < 1 or k >= n:
+    raise ValueError("Barabási–Albert graph requires 1 <= k < n, got k = {:d} and n = {:d}".format(k, n))
+
+  rng = np.random.default_rng(seed)
+
+  sources = np.repeat(np.arange(k, n, dtype = np.int64), k)
+  offsets = 2 * k * (sources - k)
+
+  picks = np.zeros(len(sources), dtype = np.int64)
+  redraw = np.arange(k, len(sources))
+
+  while len(redraw) > 0:
+    picks[redraw] = (rng.random(len(redraw)) * offsets[redraw]).astype(np.int64)
+
+    targets = np.where(picks % 2 == 0, sources[picks // 2], -1)
+    targets[:k] = np.arange(k)
+
+    pointers = picks // 2
+    pending = np.flatnonzero(targets < 0)
+    while len(pending) > 0:
+      ready = targets[pointers[pending]] >= 0
+      targets[pending[ready]] = targets[pointers[pending[ready]]]
+
+      pending = pending[~ready]
+      pointers[pending] = pointers[pointers[pending]]
+
+    rows = np.sort(targets.reshape(-1, k), axis = 1)
+    repeated = np.zeros(rows.shape, dtype = bool)
+    repeated[:, 1:] = rows[:, 1:] == rows[:, :-1]
+
+    order = np.argsort(targets.reshape(-1, k), axis = 1, kind = 'stable')
+    slots = np.zeros(rows.shape, dtype = bool)
+    np.put_along_axis(slots, order, repeated, axis = 1)
+
+    redraw = np.flatnonzero(slots.ravel())
+
+  return sources, targets
+
+def configuration(degrees, seed = None):
+  """
+  Sample edges of configuration model multigraph with given degree sequence.
+
+  Stubs of all nodes are shuffled at once and paired consecutively, so the
+  result keeps degrees exactly and may include self-loops and parallel edges.
+  """
+
+  degrees = np.asarray(degrees, dtype = np.int64)
+  if degrees.sum() % 2 != 0:
+    raise ValueError("Configuration model requires even sum of degrees")
+
+  rng = np.random.default_rng(seed)
+  stubs = rng.permutation(np.repeat(np.arange(len(degrees)), degrees))
+
+  return stubs[0::2], stubs[1::2]
+
+def degree_corrected_sbm(sources, targets, clusters, seed = None):
+  """
+  Sample edges of degree-corrected stochastic block model fitted to edges of a graph.
+
+  Stubs of edges are shuffled within the clusters of their nodes, which keeps
+  degrees of nodes and numbers of edges between each pair of clusters exactly
+  while randomizing everything else, as in the microcanonical formulation.
+  """
+
+  clusters = np.asarray(clusters)
+  rng = np.random.default_rng(seed)
+
+  stubs = np.concatenate([sources, targets]).astype(np.int64)
+  blocks = clusters[stubs]
+
+  shuffled = stubs.copy()
+  shuffled[np.argsort(blocks, kind = 'stable')] = stubs[np.lexsort((rng.random(len(stubs)), blocks))]
+
+  return shuffled[:len(sources)], shuffled[len(sources):]
+
+MODELS = {
+  'ER': 'Erdös-Rényi',
+  'BA': 'Barabási–Albert',
+  'CM': 'configuration',
+  'SBM': 'DC-SBM'
+}
+
+@timed('model')
+def null_model(G, model, seed = None, path = None):
+  """
+  Construct compact random graph of specified model matching undirected multigraph G.
+
+  Model 'ER' keeps numbers of nodes and edges, 'BA' keeps number of nodes and
+  average degree, 'CM' keeps degrees of nodes and 'SBM' further keeps numbers
+  of edges between clusters of nodes. The latter two keep node labels and
+  clusters, while other models set all clusters to 1. If path is given, the
+  graph is written to Pajek file named after G and model together with its
+  binary cache, so it can be read back with read_pajek.
+  """
+
+  G = from_networkx(G)
+  n, m = len(G), G.number_of_edges()
+
+  if model == 'ER':
+    edges = erdos_renyi(n, m, seed)
+  elif model == 'BA':
+    edges = barabasi_albert(n, max(1, round(m / n)), seed)
+  elif model == 'CM':
+    edges = configuration(G.degree, seed)
+  elif model == 'SBM':
+    edges = degree_corrected_sbm(*G.edges(), G.clusters, seed)
+  else:
+    raise ValueError("Unknown null model '{:s}'".format(model))
+
+  if model in ('CM', 'SBM'):
+    R = Graph(MODELS[model], G.labels, G.clusters, *edges)
+  else:
+    R = Graph(MODELS[model], np.arange(1, n + 1).astype(str), np.ones(n, dtype = np.int64), *edges)
+
+  if path is not None:
+    R.name = '{:s}-{:s}'.format(G.name, model)
+    write_pajek(R, path)
+
+  return R
+
+STATISTICS = ['degree', 'degree_max', 'isolates', 'components', 'lcc', 'distance', 'diameter', 'clustering']
+
+_task = None
+
+def _init(G, model, distances, clustering):
+  """
+  Share real graph, null model and requested statistics with worker process.
+  """
+
+  global _task
+  _task = (G, model, distances, clustering)
+
+def _replicate(seed):
+  """
+  Generate one replicate of null model and compute its statistics in worker process.
+  """
+
+  G, model, distances, clustering = _task
+
+  with contextlib.redirect_stdout(io.StringIO()):
+    info = graph_info(null_model(G, model, seed), distances, clustering, workers = 1)
+
+  return {stat: float(info[stat]) for stat in STATISTICS if stat in info}
+
+def _zscore(x, mean, std):
+  """
+  Standard score of x against ensemble with given mean and standard deviation.
+
+  Score is undefined and returned as nan when ensemble has no deviation.
+  """
+
+  if std > 0:
+    return (x - mean) / std
+
+  return np.nan
+
+@timed('ensemble')
+def ensemble(G, model, k = 10, workers = None, seed = None, distances = True, clustering = True):
+  """
+  Compute statistics of k replicates of null model matching undirected multigraph G in parallel.
+
+  Replicates are generated and analyzed in worker processes from independent
+  seeds, while their statistics are reduced as they arrive with Welford's
+  running mean and variance, so memory does not grow with k. Returns
+  dictionaries of means and sample standard deviations of statistics, where
+  deviations are zero for a single replicate.
+  """
+
+  G = from_networkx(G)
+  seeds = np.random.SeedSequence(seed).generate_state(k).tolist()
+
+  count, mean, m2 = 0, {}, {}
+  for stats in pimap(_replicate, seeds, workers, _init, (G, model, distances, clustering)):
+    count += 1
+    for stat, x in stats.items():
+      delta = x - mean.get(stat, 0.0)
+      mean[stat] = mean.get(stat, 0.0) + delta / count
+      m2[stat] = m2.get(stat, 0.0) + delta * (x - mean[stat])
+
+  return {'k': count, 'mean': mean, 'std': {stat: np.sqrt(m2[stat] / (count - 1)) if count > 1 else 0.0 for stat in mean}}
+
+def ensemble_info(G, models = ('ER', 'BA'), k = 10, workers = None, seed = None, distances = True, clustering = True):
+  """
+  Print out statistics of undirected multigraph G against ensembles of null models.
+
+  For each model, mean and standard deviation of each statistic over k
+  replicates are shown together with z-score of the real network, which is
+  shown as n/a when statistic does not vary across replicates.
+  Returns statistics of real network and ensemble results by model.
+  """
+
+  G = from_networkx(G)
+  info = graph_info(G, distances, clustering, workers)
+
+  results = {}
+  for model in models:
+    results[model] = ensemble(G, model, k, workers, seed, distances, clustering)
+    mean, std = results[model]['mean'], results[model]['std']
+
+    print("{0:>15s} | '{1:s}' ({2:d}x)".format('Model', MODELS[model], k))
+
+    results[model]['z'] = {}
+    for stat in mean:
+      z = results[model]['z'][stat] = _zscore(float(info[stat]), mean[stat], std[stat])
+      print("{0:>15s} | {1:,.3f} ({2:,.3f}) vs. {3:,.3f} z = {4:s}".format(stat.replace('_', '-').capitalize(), mean[stat], std[stat], float(info[stat]), 'n/a' if np.isnan(z) else '{:+.2f}'.format(z)))
+    print()
+
+  return info, results
@@ -0,0 +1,188 @@
+import os
+import re
+import json
+import shutil
+
+import numpy as np
+
+from graph import Graph
+from instrument import timed
+
+VERTEX = re.compile(r'^[ \t]*(\d+)(?:[ \t]+(?:"([^"]*)"|([^\s"]+)))?(?:[ \t]+(-?\d+)(?=\s|$))?', re.M)
+SECTION = re.compile(r'^\*(\w+)[^\n]*$', re.M)
+
+CACHE = 2
+ARRAYS = ['labels', 'clusters', 'sources', 'targets', 'multiplicity', 'indptr', 'indices', 'mult']
+
+@timed('load')
+def read_pajek(file, path = '../nets', cache = True):
+  """
+  Construct compact undirected multigraph G from specified file in Pajek format.
+
+  Unless cache is False, parsed arrays are stored in binary form in directory
+  'file.cache' next to the source and memory-mapped on subsequent calls until
+  the modification time or size of the source changes.
+  """
+
+  source = os.path.join(path, file + '.net')
+
+  if cache:
+    G = load_cache(file, path)
+    if G is not None:
+      return G
+
+  with open(source, 'r') as f:
+    text = f.read()
+
+  labels, clusters, sources, targets = parse_pajek(text)
+
+  G = Graph(file, labels, clusters, sources, targets)
+
+  if cache:
+    save_cache(G, path)
+
+  return G
+
+def write_pajek(G, path = '../nets', cache = True):
+  """
+  Write compact undirected multigraph G to file named after G in Pajek format.
+
+  Unless cache is False, arrays of G are also stored in binary cache, so
+  subsequent calls of read_pajek memory-map G without parsing.
+  """
+
+  source = os.path.join(path, G.name + '.net')
+
+  with open(source, 'w') as f:
+    f.write('*vertices {:d}\n'.format(len(G)))
+    f.writelines('{:d} "{:s}" {:d}\n'.format(i, label, c) for i, (label, c) in enumerate(zip(G.labels.tolist(), G.clusters.tolist()), 1))
+
+    f.write('*edges {:d}\n'.format(G.number_of_edges()))
+    np.savetxt(f, np.column_stack(G.edges()).astype(np.int64) + 1, fmt = '%d')
+
+  if cache:
+    save_cache(G, path)
+
+def _stamp(source):
+  """
+  Identify version of source file by its modification time and size.
+  """
+
+  stat = os.stat(source)
+
+  return {'version': CACHE, 'mtime': stat.st_mtime_ns, 'size': stat.st_size}
+
+def load_cache(file, path = '../nets'):
+  """
+  Memory-map compact graph from cache of specified file or return None if stale.
+  """
+
+  folder = os.path.join(path, file + '.cache')
+
+  try:
+    with open(os.path.join(folder, 'meta.json'), 'r') as f:
+      meta = json.load(f)
+    if meta != _stamp(os.path.join(path, file + '.net')):
+      return None
+
+    arrays = {name: np.load(os.path.join(folder, name + '.npy'), mmap_mode = 'r') for name in ARRAYS}
+  except (OSError, ValueError):
+    return None
+
+  return Graph(file, arrays['labels'], arrays['clusters'], arrays['sources'], arrays['targets'], (arrays['indptr'], arrays['indices'], arrays['mult']), arrays['multiplicity'])
+
+def save_cache(G, path = '../nets'):
+  """
+  Store arrays of compact graph G in cache next to its source file.
+  """
+
+  folder = os.path.join(path, G.name + '.cache')
+  temp = folder + '.' + str(os.getpid())
+
+  try:
+    os.makedirs(temp, exist_ok = True)
+    for name in ARRAYS:
+      np.save(os.path.join(temp, name + '.npy'), np.ascontiguousarray(getattr(G, name)))
+    with open(os.path.join(temp, 'meta.json'), 'w') as f:
+      json.dump(_stamp(os.path.join(path, G.name + '.net')), f)
+
+    shutil.rmtree(folder, ignore_errors = True)
+    os.replace(temp, folder)
+  except OSError:
+    shutil.rmtree(temp, ignore_errors = True)
+
+def parse_pajek(text):
+  """
+  Parse text in Pajek format into arrays of node labels, clusters and edges.
+  """
+
+  parts = SECTION.split(text)
+
+  ids, labels, clusters = [], [], []
+  edges = []
+  for section, body in zip(parts[1::2], parts[2::2]):
+    section = section.lower()
+    if section == 'vertices':
+      vertices = parse_vertices(body)
+      ids.extend(vertices[0].tolist())
+      labels.extend(vertices[1].tolist())
+      clusters.extend(vertices[2].tolist())
+    elif section in ('edges', 'arcs'):
+      edges.append(_parse_edges(body))
+
+  ids = np.array(ids, dtype = np.int64)
+  index = np.full(ids.max() + 1 if len(ids) > 0 else 1, -1, dtype = np.int64)
+  index[ids] = np.arange(len(ids))
+
+  edges = np.concatenate(edges) if len(edges) > 0 else np.zeros((0, 2), dtype = np.int64)
+
+  return np.array(labels, dtype = str), np.array(clusters, dtype = np.int64), lookup(index, edges[:, 0]), lookup(index, edges[:, 1])
+
+def parse_vertices(text):
+  """
+  Parse vertex lines in Pajek format into arrays of node identifiers, labels and clusters.
+
+  Labels may be quoted or unquoted, while vertex lines without label are
+  labelled by their identifiers as in NetworkX.
+  """
+
+  vertices = VERTEX.findall(text)
+  if len(vertices) == 0:
+    return np.zeros(0, dtype = np.int64), np.zeros(0, dtype = str), np.zeros(0, dtype = np.int64)
+
+  ids, quoted, bare, clusters = zip(*vertices)
+  labels = [q or b or i for i, q, b in zip(ids, quoted, bare)]
+
+  return np.array(ids, dtype = np.int64), np.array(labels, dtype = str), np.array([c or 0 for c in clusters], dtype = np.int64)
+
+def lookup(index, ids):
+  """
+  Map Pajek identifiers of nodes to indices or raise error for undefined vertices.
+  """
+
+  ids = np.asarray(ids, dtype = np.int64)
+  undefined = (ids < 0) | (ids >= len(index))
+  undefined[~undefined] = index[ids[~undefined]] < 0
+
+  if np.any(undefined):
+    raise ValueError("Edge references undefined vertex {:d}".format(int(ids[undefined][0])))
+
+  return index[ids]
+
+def _parse_edges(body):
+  """
+  Parse section of edges or arcs into array of node identifier pairs.
+  """
+
+  lines = body.strip().split('\n')
+  if len(lines) == 0 or lines[0].strip() == '':
+    return np.zeros((0, 2), dtype = np.int64)
+
+  cols = len(lines[0].split())
+  tokens = body.split()
+  if len(tokens) == cols * len(lines):
+    if cols == 2:
+      return np.array(tokens, dtype = np.int64).reshape(-1, 2)
+    return np.array(tokens[0::cols] + tokens[1::cols], dtype = np.int64).reshape(2, -1).T
+
+  return np.array([line.split()[:2] for line in lines if line.strip() != ''], dtype = np.int64)
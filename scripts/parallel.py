@@ -0,0 +1,54 @@
+import os
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import instrument
+
+def workers_count(workers = None, tasks = None):
+  """
+  Number of worker processes for specified number of tasks.
+  """
+
+  workers = (os.cpu_count() or 1) if workers is None else workers
+
+  return max(1, min(workers, tasks) if tasks is not None else workers)
+
+def pmap(func, tasks, workers = None, initializer = None, initargs = ()):
+  """
+  Map func over tasks in pool of worker processes and return list of results.
+
+  Shared data such as graph arrays is shipped to each worker once through
+  initializer and initargs, which are inherited without pickling when
+  processes are forked. With a single worker, tasks run in this process.
+  """
+
+  return list(pimap(func, tasks, workers, initializer, initargs))
+
+def pimap(func, tasks, workers = None, initializer = None, initargs = ()):
+  """
+  Map func over tasks in pool of worker processes and yield results in order as they finish.
+
+  Unlike pmap, results are not collected, so they can be reduced one by one
+  while the remaining tasks are still running. When instrumentation is
+  enabled, stages recorded in worker processes are sent back with results.
+  """
+
+  tasks = list(tasks)
+  workers = workers_count(workers, len(tasks))
+
+  if workers == 1:
+    if initializer is not None:
+      initializer(*initargs)
+    yield from (func(task) for task in tasks)
+    return
+
+  context = mp.get_context('fork') if 'fork' in mp.get_all_start_methods() else None
+
+  with ProcessPoolExecutor(max_workers = workers, mp_context = context, initializer = initializer, initargs = initargs) as pool:
+    if not instrument.enabled():
+      yield from pool.map(func, tasks)
+      return
+
+    for result, records in pool.map(instrument.traced, [(func, task) for task in tasks]):
+      instrument.merge(records)
+      yield result
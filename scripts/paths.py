@@ -0,0 +1,167 @@
+from statistics import NormalDist
+
+import numpy as np
+from scipy.sparse import csgraph
+
+from parallel import pmap
+
+BITS = 64
+
+_graph = None
+
+def _init(indptr, indices):
+  """
+  Share CSR adjacency with worker process.
+  """
+
+  global _graph
+  _graph = (indptr, indices)
+
+def _ranges(starts, sizes):
+  """
+  Concatenate index ranges [start, start + size) into single array.
+  """
+
+  offsets = np.repeat(starts - np.cumsum(sizes) + sizes, sizes)
+
+  return offsets + np.arange(sizes.sum())
+
+def _popcounts(masks, k):
+  """
+  Count set bits at each of first k positions over array of 64-bit masks.
+  """
+
+  bits = np.unpackbits(masks.view(np.uint8), bitorder = 'little').reshape(-1, BITS)
+
+  return bits[:, :k].sum(axis = 0)
+
+def bfs_counts(indptr, indices, sources):
+  """
+  Count nodes at each distance from up to 64 sources with bit-parallel BFS.
+
+  Each node holds a 64-bit mask of sources that have reached it, so a single
+  sweep over the adjacency advances all breadth-first searches by one level.
+  Sparse frontiers are pushed along their own edges, while dense frontiers
+  are pulled over all edges with bitwise reductions. Returns matrix of
+  counts with rows for distances and columns for sources.
+  """
+
+  n = len(indptr) - 1
+  k = len(sources)
+
+  seen = np.zeros(n, dtype = np.uint64)
+  np.bitwise_or.at(seen, sources, np.left_shift(np.uint64(1), np.arange(k, dtype = np.uint64)))
+
+  current = seen.copy()
+  frontier = np.flatnonzero(current)
+  counts = [_popcounts(current[frontier], k)]
+
+  starts, sizes = indptr[:-1], np.diff(indptr)
+  rows = np.flatnonzero(sizes)
+
+  while True:
+    reached = np.zeros(n, dtype = np.uint64)
+    if sizes[frontier].sum() < len(indices) // 8:
+      ends = np.repeat(frontier, sizes[frontier])
+      np.bitwise_or.at(reached, indices[_ranges(starts[frontier], sizes[frontier])], current[ends])
+    else:
+      reached[rows] = np.bitwise_or.reduceat(current[indices], starts[rows])
+
+    reached &= ~seen
+    frontier = np.flatnonzero(reached)
+    if len(frontier) == 0:
+      break
+
+    seen |= reached
+    current = reached
+    counts.append(_popcounts(current[frontier], k))
+
+  return np.array(counts)
+
+def _block(sources):
+  """
+  Count nodes at each distance from block of sources in worker process.
+  """
+
+  return bfs_counts(_graph[0], _graph[1], sources)
+
+def _counts(A, sources, workers = None):
+  """
+  Count nodes at each distance from all sources in parallel blocks of 64.
+  """
+
+  blocks = [sources[b:b + BITS] for b in range(0, len(sources), BITS)]
+  results = pmap(_block, blocks, workers, _init, (A.indptr, A.indices))
+
+  levels = max(len(counts) for counts in results)
+
+  return np.hstack([np.pad(counts, ((0, levels - len(counts)), (0, 0))) for counts in results])
+
+def eccentricities(A, nodes, workers = None):
+  """
+  Compute eccentricities of specified nodes of connected graph with adjacency A.
+  """
+
+  counts = _counts(A, np.asarray(nodes), workers)
+
+  return len(counts) - 1 - np.argmax(counts[::-1] > 0, axis = 0)
+
+def diameter(A, workers = None):
+  """
+  Compute exact diameter of connected graph with adjacency A with iFUB.
+
+  Starting from the highest degree node u, eccentricities of nodes in fringes
+  at decreasing distance i from u are computed in bit-parallel blocks until
+  the lower bound exceeds the upper bound 2(i - 1).
+  """
+
+  u = np.argmax(np.diff(A.indptr))
+  ds = csgraph.shortest_path(A, directed = False, unweighted = True, indices = u).astype(np.int64)
+
+  i = int(ds.max())
+  lb, ub = i, 2 * i
+
+  while ub > lb:
+    lb = max(lb, int(eccentricities(A, np.flatnonzero(ds == i), workers).max()))
+    if lb > 2 * (i - 1):
+      break
+
+    ub = 2 * (i - 1)
+    i -= 1
+
+  return lb
+
+def approx_dists(A, n = 100, exact = False, workers = None, seed = None, level = 0.95):
+  """
+  Compute approximate average distance and diameter of connected graph with adjacency A.
+
+  Distances from n sampled sources are accumulated into a histogram with
+  bit-parallel BFS in worker processes, and the confidence interval of the
+  average distance at specified level follows from per-source averages. With
+  exact, diameter is computed exactly with iFUB.
+  """
+
+  N = A.shape[0]
+
+  rng = np.random.default_rng(seed)
+  sources = np.arange(N) if N <= n else rng.choice(N, n, replace = False)
+
+  counts = _counts(A, sources, workers)
+  counts[0] = 0
+
+  hist = counts.sum(axis = 1)
+  ds = np.arange(len(hist))
+
+  d = (ds @ hist) / hist.sum() if hist.sum() > 0 else 0.0
+  D = len(hist) - 1
+
+  h = 0.0
+  k = len(sources)
+  if 1 < k < N:
+    xs = (ds @ counts) / np.maximum(counts.sum(axis = 0), 1)
+    h = NormalDist().inv_cdf((1 + level) / 2) * xs.std(ddof = 1) / np.sqrt(k) * np.sqrt((N - k) / (N - 1))
+
+  if exact and k < N:
+    D = diameter(A, workers)
+
+  return {'distance': d, 'diameter': D, 'ci': (d - h, d + h), 'histogram': hist, 'sources': k, 'exact': exact or k == N}
@@ -1,96 +1,62 @@
-import os
 from time import *
 
-import networkx as nx
+from pajek import read_pajek
+from stats import graph_info
+from centrality import top_closeness, approx_betweenness
+from ranking import top_k
+from spectral import Spectral
+from triangles import clustering
 
-def read_pajek(file, path = '../nets'):
+def top_nodes(G, centrality, degrees, label, n = 15, top = None):
   """
-  Construct undirected multigraph G from specified file in Pajek format.
-  """
-  
-  G = nx.read_pajek(os.path.join(path, file + '.net'))
-  G.name = file
-  
-  return G
-  
-def graph_info(G):
-  """
-  Compute and print out standard statistics of undirected multigraph G.
-  """
-  
-  tic = time()
-  
-  print("{0:>15s} | '{1:s}'".format('Graph', G.name.replace('_', '-')))
-  
-  multi = False
-  for edge in G.edges():
-    if G.number_of_edges(edge[0], edge[1]) > 1:
-      multi = True
-      break
-      
-  print("{0:>15s} | '{1:s}'".format('Type', '===' if multi else '---'))
-  
-  n = G.number_of_nodes()
-  m = G.number_of_edges()
-  
-  print("{0:>15s} | {1:,d} ({2:,d})".format('Nodes', n, nx.number_of_isolates(G)))
-  print("{0:>15s} | {1:,d} ({2:,d})".format('Edges', m, nx.number_of_selfloops(G)))
-  
-  ks = [k for _, k in G.degree()]
-  
-  print("{0:>15s} | {1:.1f} ({2:,d}, {3:,d})".format('Degree', 2 * m / n, min(ks), max(ks)))
-  print("{0:>15s} | {1:.8f}".format('Density', 2 * m / n / (n - 1)))
-  
-  CCs = sorted(nx.connected_components(G), key = len, reverse = True)
-
-  print("{0:>15s} | {1:.1f}% ({2:,d})".format('Components', 100 * len(CCs[0]) / n, len(CCs)))
-  
-  print("{0:>15s} | {1:.1f} sec\n".format('Time', time() - tic))
-
-def top_nodes(G, centrality, label, n = 15):
-  """
-  Compute and print out node centralities of undirected multigraph G.
+  Print out top node centralities of undirected multigraph G from arrays of centralities and degrees.
   """
   
   print("{0:>15s} | '{1:s}'".format('Graph', G.name.replace('_', '-')))
   print("{0:>15s} | '{1:s}'".format('Centrality', label))
   
-  for p, (i, c) in enumerate(sorted(centrality.items(), key = lambda item: (-item[1], -G.degree(item[0]), item[0]))):
-    if p >= n:
-      break
-    print("{0:>15.8f} | '{1:s}' ({2:,d})".format(c, i, G.degree(i)))
+  for i in (top_k(centrality, degrees, G.labels, n) if top is None else top):
+    print("{0:>15.8f} | '{1:s}' ({2:,d})".format(centrality[i], G.labels[i], degrees[i]))
   print()
 
 toc = time()
 
-for file in ['got-kills', 'lpp', 'ingredients', 'imdb']:
+for file in ['got-kills', 'lpp', 'ingredients', 'imdb', 'wikileaks']:
 
   # Constructs a graph of real network
   
-  G = read_pajek(file)
-  G = nx.Graph(G)
+  K = read_pajek(file)
   
   # Prints out statistics of real network
   
-  graph_info(G)
+  graph_info(K.view(multi = False))
   
   # Prints top degree centrality nodes of real network
 
-  top_nodes(G, nx.degree_centrality(G), 'degree')
+  ks = K.view(multi = False).degree
+
+  top_nodes(K, ks / (len(K) - 1), ks, 'degree')
   
   # Prints top clustering coefficient nodes of real network
 
-  top_nodes(G, nx.clustering(G), 'clustering')
-  top_nodes(G, {i: c * (G.degree(i) - 1) for i, c in nx.clustering(G).items()}, 'μ-clustering')
+  cs = clustering(K)
+
+  top_nodes(K, cs['clustering'], ks, 'clustering')
+  top_nodes(K, cs['mu'], ks, 'μ-clustering')
 
   # Prints top spectral centrality nodes of real network
   
-  top_nodes(G, nx.eigenvector_centrality(G, tol = 1e-04), 'eigenvector')
-  top_nodes(G, nx.pagerank(G), 'pagerank')
+  S = Spectral(K)
+
+  top_nodes(K, S.eigenvector(tol = 1e-04), ks, 'eigenvector')
+  top_nodes(K, S.pagerank(), ks, 'pagerank')
 
   # Prints top distance centrality nodes of real network
 
-  top_nodes(G, nx.closeness_centrality(G), 'closeness')
-  top_nodes(G, nx.betweenness_centrality(G), 'betweenness')
+  cs = top_closeness(K, 15, ks)
+  bs = approx_betweenness(K, k = 15)
+
+  top_nodes(K, cs['closeness'], ks, 'closeness', top = cs['top'])
+  top_nodes(K, bs['betweenness'], ks, 'betweenness' if bs['exact'] else 'betweenness ({:,d} pivots)'.format(bs['samples']))
 
 print("{0:>15s} | {1:.1f} sec\n".format('Total', time() - toc))
@@ -0,0 +1,174 @@
+import numpy as np
+
+from cdlib.classes import NodeClustering
+
+from graph import from_networkx
+from instrument import timed
+
+def _edges(G, multi = True):
+  """
+  Sources, targets and weights of adjacency entries of compact graph G without self-loops.
+  """
+
+  sizes = np.diff(G.indptr)
+  rows = np.repeat(np.arange(len(G)), sizes)
+  keep = G.indices != rows
+
+  return rows[keep], G.indices[keep], (G.mult if multi else np.ones(len(G.indices), dtype = G.mult.dtype))[keep]
+
+def colouring(G, rng = np.random):
+  """
+  Compute proper colouring of nodes of compact graph G by random priority independent sets.
+
+  In each round, uncoloured nodes whose random priority exceeds priorities
+  of all their uncoloured neighbors form an independent set that receives
+  the next colour, where every round is a vectorized reduction over edges.
+  Returns array of colours numbered from 0 upwards.
+  """
+
+  n = len(G)
+  u, v, _ = _edges(G)
+
+  priority = rng.permutation(n)
+  colours = np.full(n, -1, dtype = np.int64)
+
+  c = 0
+  while len(u) > 0:
+    top = np.full(n, -1, dtype = np.int64)
+    np.maximum.at(top, u, priority[v])
+
+    chosen = (colours < 0) & (priority > top)
+    colours[chosen] = c
+    c += 1
+
+    alive = ~chosen[u] & ~chosen[v]
+    u, v = u[alive], v[alive]
+
+  colours[colours < 0] = c
+
+  return colours
+
+def _argmax(groups, values, keys):
+  """
+  Indices of maximal values within each contiguous group of sorted group array.
+
+  Ties are broken by the largest of tie-breaking keys.
+  """
+
+  starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+  ids = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(groups)]))
+
+  best = values == np.maximum.reduceat(values, starts)[ids]
+  ties = np.where(best, keys, -1.0)
+
+  return np.flatnonzero(ties == np.maximum.reduceat(ties, starts)[ids]), best
+
+def _update(labels, u, v, w, rng = None):
+  """
+  Update labels of nodes simultaneously to the most frequent labels among their neighbors.
+
+  Current label is kept whenever it is among the most frequent ones, while
+  ties are otherwise broken at random or to the largest label without rng
+  as in Prec-Max rule. Returns number of changed labels.
+  """
+
+  n = len(labels)
+  keys, inverse = np.unique(u * n + labels[v], return_inverse = True)
+  weights = np.bincount(inverse.ravel(), weights = w)
+
+  owners, candidates = keys // n, keys % n
+  chosen, best = _argmax(owners, weights, candidates if rng is None else rng.random(len(keys)))
+
+  stay = np.zeros(n, dtype = bool)
+  stay[owners[best & (candidates == labels[owners])]] = True
+
+  chosen = chosen[~stay[owners[chosen]]]
+  labels[owners[chosen]] = candidates[chosen]
+
+  return len(chosen)
+
+@timed('propagation')
+def label_propagation(G, mode = 'semi', multi = True, max_iter = 100, seed = None, graph = None):
+  """
+  Find clusters of undirected multigraph G with label propagation on its compact adjacency.
+
+  Each node starts with its own label and repeatedly adopts the label most
+  frequent among its neighbors, where parallel edges count as weights with
+  multi. In mode 'async', nodes are updated one by one in random order of
+  each sweep in a tight loop over adjacency lists. In mode 'semi', nodes are
+  first coloured so that each colour class is updated simultaneously with a
+  vectorized reduction and ties are broken by Prec-Max rule as in NetworkX.
+  Also mode 'sync' updates all nodes simultaneously with random ties, which
+  is fastest but may oscillate.
+  Propagation stops after a sweep without changes or after max_iter sweeps.
+  Returns clustering with numbers of changed labels per sweep in parameters
+  on NetworkX graph, which is either G, G converted from compact graph or
+  graph given together with its compact graph G.
+  """
+
+  rng = np.random if seed is None else np.random.RandomState(seed)
+
+  C = from_networkx(G)
+  if graph is None:
+    graph = G.to_networkx(multi = False) if G is C else G
+  nodes = list(graph.nodes())
+
+  n = len(C)
+  labels = np.arange(n)
+  u, v, w = _edges(C, multi)
+
+  sweeps = []
+  if mode == 'async':
+    indptr = np.r_[0, np.cumsum(np.bincount(u, minlength = n))].tolist()
+    targets, weights = v.tolist(), w.tolist()
+    labels = labels.tolist()
+
+    while len(sweeps) < max_iter:
+      changes = 0
+      for i in rng.permutation(n).tolist():
+        counts = {}
+        for j in range(indptr[i], indptr[i + 1]):
+          l = labels[targets[j]]
+          counts[l] = counts.get(l, 0) + weights[j]
+
+        if len(counts) == 0:
+          continue
+
+        top = max(counts.values())
+        if counts.get(labels[i], 0) < top:
+          best = [l for l, c in counts.items() if c == top]
+          labels[i] = best[rng.randint(len(best))]
+          changes += 1
+
+      sweeps.append(changes)
+      if changes == 0:
+        break
+
+    labels = np.array(labels)
+
+  elif mode in ('semi', 'sync'):
+    colours = colouring(C, rng)[u] if mode == 'semi' else np.zeros(len(u), dtype = np.int64)
+
+    order = np.argsort(colours, kind = 'stable')
+    u, v, w, colours = u[order], v[order], w[order], colours[order]
+    bounds = np.flatnonzero(np.r_[True, colours[1:] != colours[:-1], True]) if len(u) > 0 else np.zeros(1, dtype = np.int64)
+
+    while len(sweeps) < max_iter:
+      changes = sum(_update(labels, u[i:j], v[i:j], w[i:j], None if mode == 'semi' else rng) for i, j in zip(bounds[:-1], bounds[1:]))
+
+      sweeps.append(changes)
+      if changes == 0:
+        break
+
+  else:
+    raise ValueError("Unknown label propagation mode '{:s}'".format(mode))
+
+  groups = np.unique(labels, return_inverse = True)[1].ravel()
+  sizes = np.bincount(groups)
+
+  members = np.split(np.argsort(groups, kind = 'stable'), np.cumsum(sizes)[:-1])
+  order = np.argsort(-sizes, kind = 'stable')
+
+  communities = [[nodes[i] for i in members[c].tolist()] for c in order.tolist()]
+
+  return NodeClustering(communities, graph, 'Label Propagation', method_parameters = {'mode': mode, 'multi': multi, 'sweeps': sweeps})
@@ -0,0 +1,23 @@
+import heapq
+
+import numpy as np
+
+def top_k(values, degrees, labels, k = 15):
+  """
+  Indices of k nodes with highest values ranked by -value, -degree and label.
+
+  The k-th highest value is found by linear-time partitioning, after which
+  only nodes with values at least as high are ranked with a heap of size k,
+  which takes O(n log k) time even when many nodes are tied.
+  """
+
+  values = np.asarray(values)
+  n = len(values)
+
+  candidates = np.arange(n)
+  if k < n:
+    candidates = np.flatnonzero(values >= np.partition(values, n - k)[n - k])
+
+  vs, ks, ls = values[candidates].tolist(), np.asarray(degrees)[candidates].tolist(), np.asarray(labels)[candidates].tolist()
+
+  return candidates[heapq.nsmallest(k, range(len(candidates)), key = lambda i: (-vs[i], -ks[i], ls[i]))]
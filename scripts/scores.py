@@ -0,0 +1,107 @@
+import numpy as np
+import scipy.sparse as sp
+
+def partition(communities, index, n = None):
+  """
+  Construct integer label array from list of communities given node index dictionary.
+
+  Nodes in no community are assigned separate singleton labels, while nodes
+  in several communities keep the label of the last one.
+  """
+
+  n = len(index) if n is None else n
+  labels = np.full(n, -1, dtype = np.int64)
+
+  for c, comm in enumerate(communities):
+    labels[[index[i] for i in comm]] = c
+
+  missing = labels < 0
+  labels[missing] = len(communities) + np.arange(np.count_nonzero(missing))
+
+  return labels
+
+def modularity(A, labels, resolution = 1.0):
+  """
+  Compute modularity Q of node labels on undirected graph with sparse adjacency A.
+
+  Entries of A are edge weights or multiplicities with self-loops on the
+  diagonal, so a binary A gives the simple graph variant and a multiplicity A
+  the multigraph variant. Resolution scales the null model term.
+  """
+
+  A = A.tocoo()
+  loops = A.row == A.col
+
+  ks = np.bincount(A.row, weights = A.data, minlength = A.shape[0]) + np.bincount(A.row[loops], weights = A.data[loops], minlength = A.shape[0])
+  m2 = ks.sum()
+  if m2 == 0:
+    raise ValueError('A graph without link has an undefined modularity')
+
+  same = labels[A.row] == labels[A.col]
+  internal = A.data[same].sum() + A.data[loops].sum()
+  degrees = np.bincount(labels, weights = ks)
+
+  return float(internal / m2 - resolution * ((degrees / m2)**2).sum())
+
+def contingency(a, b):
+  """
+  Compute sparse contingency table of two integer label arrays.
+  """
+
+  a = np.unique(a, return_inverse = True)[1]
+  b = np.unique(b, return_inverse = True)[1]
+
+  pairs, counts = np.unique(a * (b.max() + 1) + b, return_counts = True)
+
+  return sp.coo_matrix((counts, (pairs // (b.max() + 1), pairs % (b.max() + 1))), shape = (a.max() + 1, b.max() + 1))
+
+def _entropy(counts):
+  """
+  Entropy of distribution given by counts.
+  """
+
+  p = counts[counts > 0] / counts.sum()
+
+  return float(-(p * np.log(p)).sum())
+
+def nmi(a, b):
+  """
+  Compute normalized mutual information of two label arrays with arithmetic normalization.
+  """
+
+  C = contingency(a, b)
+  n = C.data.sum()
+
+  rows = np.asarray(C.sum(axis = 1)).ravel()
+  cols = np.asarray(C.sum(axis = 0)).ravel()
+
+  if len(rows) == len(cols) == 1:
+    return 1.0
+
+  mi = float((C.data / n * np.log(n * C.data / (rows[C.row] * cols[C.col]))).sum())
+  if mi <= 0:
+    return 0.0
+
+  return mi / ((_entropy(rows) + _entropy(cols)) / 2)
+
+def ari(a, b):
+  """
+  Compute adjusted Rand index of two label arrays.
+  """
+
+  C = contingency(a, b)
+  n = C.data.sum()
+
+  pairs = lambda x: (x * (x - 1) / 2).sum()
+
+  index = pairs(C.data)
+  rows = pairs(np.asarray(C.sum(axis = 1)).ravel())
+  cols = pairs(np.asarray(C.sum(axis = 0)).ravel())
+
+  expected = rows * cols / (n * (n - 1) / 2) if n > 1 else 0.0
+  maximum = (rows + cols) / 2
+
+  if maximum == expected:
+    return 1.0
+
+  return float((index - expected) / (maximum - expected))
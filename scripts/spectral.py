@@ -0,0 +1,103 @@
+import numpy as np
+
+from instrument import timed
+
+class Spectral:
+  """
+  Spectral centralities of undirected graph G computed on shared sparse operators.
+
+  Adjacency matrix and its column-stochastic normalization are built once,
+  after which eigenvector, PageRank and Katz centralities are power iterations
+  of sparse matrix-vector products. Each method accepts starting vector x0 to
+  warm start from a previous solution, while PageRank also accepts an array
+  of damping factors that are iterated together as columns of one matrix.
+  Parallel edges are counted only when multi is True.
+  """
+
+  def __init__(self, G, multi = False):
+    self.labels = G.labels
+    self.A = G.adjacency(multi = multi).astype(float)
+
+    ks = np.asarray(self.A.sum(axis = 0)).ravel()
+
+    self.dangling = ks == 0
+    self.P = self.A.multiply(1 / np.where(self.dangling, 1, ks)).tocsr()
+
+  def __len__(self):
+    return self.A.shape[0]
+
+  def _size(self, *args, **kwargs):
+    """
+    Numbers of nodes and edges of graph recorded as input size of stages.
+    """
+
+    return {'nodes': self.A.shape[0], 'edges': int((self.A.nnz + np.count_nonzero(self.A.diagonal())) // 2)}
+
+  @timed('eigenvector', size = _size)
+  def eigenvector(self, x0 = None, tol = 1e-06, max_iter = 100):
+    """
+    Compute eigenvector centralities by power iteration on A + I as in NetworkX.
+    """
+
+    n = len(self)
+    x = np.ones(n) / n if x0 is None else np.asarray(x0, dtype = float) / np.sum(x0)
+
+    for _ in range(max_iter):
+      last = x
+      x = last + self.A @ last
+      x /= np.linalg.norm(x) or 1
+
+      if np.abs(x - last).sum() < n * tol:
+        return x
+
+    raise RuntimeError('eigenvector centrality failed to converge in {:d} iterations'.format(max_iter))
+
+  @timed('pagerank', size = _size)
+  def pagerank(self, alpha = 0.85, x0 = None, tol = 1e-06, max_iter = 100):
+    """
+    Compute PageRank scores for one or more damping factors alpha as in NetworkX.
+
+    With an array of damping factors, returns a matrix with a column of scores
+    for each factor that are all computed in the same batched iteration.
+    """
+
+    n = len(self)
+    alphas = np.atleast_1d(np.asarray(alpha, dtype = float))
+
+    x = np.full((n, len(alphas)), 1 / n) if x0 is None else np.array(x0, dtype = float).reshape(n, -1) * np.ones(len(alphas))
+    x /= x.sum(axis = 0)
+
+    for _ in range(max_iter):
+      last = x
+      x = alphas * (self.P @ last + last[self.dangling].sum(axis = 0) / n) + (1 - alphas) / n
+
+      if np.all(np.abs(x - last).sum(axis = 0) < n * tol):
+        return x[:, 0] if np.ndim(alpha) == 0 else x
+
+    raise RuntimeError('pagerank failed to converge in {:d} iterations'.format(max_iter))
+
+  @timed('katz', size = _size)
+  def katz(self, alpha = 0.1, beta = 1.0, x0 = None, tol = 1e-06, max_iter = 1000):
+    """
+    Compute Katz centralities with attenuation alpha and bias beta as in NetworkX.
+
+    Normalized starting vector x0 is rescaled to the least-squares scale of
+    the fixed point before iterating.
+    """
+
+    n = len(self)
+    x = np.zeros(n)
+
+    if x0 is not None:
+      x = np.asarray(x0, dtype = float)
+      y = x - alpha * (self.A @ x)
+      x = x * beta * y.sum() / (y @ y)
+
+    for _ in range(max_iter):
+      last = x
+      x = alpha * (self.A @ last) + beta
+
+      if np.abs(x - last).sum() < n * tol:
+        return x / (np.linalg.norm(x) or 1)
+
+    raise RuntimeError('Katz centrality failed to converge in {:d} iterations'.format(max_iter))
@@ -0,0 +1,374 @@
+from time import *
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse import csgraph
+
+from graph import from_networkx
+from paths import approx_dists
+from triangles import clustering as triangle_clustering
+from instrument import stage, timed
+
+@timed('stats')
+def graph_info(G, distances = False, clustering = False, workers = None):
+  """
+  Compute and print out standard statistics of undirected multigraph G.
+
+  G is either a compact graph or a NetworkX graph, while average distance and
+  clustering coefficient are only computed on request. Distances are estimated
+  from sampled sources, where diameter is exact if distances is 'exact'. Statistics are returned
+  as a dictionary together with timings of separate stages under 'times'.
+  Distances and clustering are computed with given number of worker processes.
+  """
+
+  tic = time()
+
+  G = from_networkx(G)
+  times = {}
+
+  print("{0:>15s} | '{1:s}'".format('Graph', G.name.replace('_', '-')))
+
+  with stage('degrees'):
+    A = G.adjacency()
+    loops = A.diagonal()
+
+    info = {'name': G.name, 'multi': bool(A.nnz > 0 and A.data.max() > 1)}
+
+    print("{0:>15s} | '{1:s}'".format('Type', '===' if info['multi'] else '---'))
+
+    n = A.shape[0]
+    m = int((A.sum() + loops.sum()) // 2)
+
+    ks = np.asarray(A.sum(axis = 1)).ravel() + loops
+
+    info.update({'nodes': n, 'isolates': int(np.count_nonzero(ks == 0)), 'edges': m, 'selfloops': int(loops.sum())})
+
+    print("{0:>15s} | {1:,d} ({2:,d})".format('Nodes', n, info['isolates']))
+    print("{0:>15s} | {1:,d} ({2:,d})".format('Edges', m, info['selfloops']))
+
+    info.update({'degree': 2 * m / n, 'degree_min': int(ks.min()), 'degree_max': int(ks.max()), 'density': 2 * m / n / (n - 1) if n > 1 else 0.0})
+
+    print("{0:>15s} | {1:.1f} ({2:,d}, {3:,d})".format('Degree', info['degree'], info['degree_min'], info['degree_max']))
+    print("{0:>15s} | {1:.8f}".format('Density', info['density']))
+
+  times['degrees'] = time() - tic
+  toc = time()
+
+  with stage('components'):
+    c, labels = csgraph.connected_components(A, directed = False)
+    sizes = np.bincount(labels)
+
+    info.update({'components': c, 'lcc': int(sizes.max())})
+
+    print("{0:>15s} | {1:.1f}% ({2:,d})".format('Components', 100 * info['lcc'] / n, c))
+
+  times['components'] = time() - toc
+
+  B = G.adjacency(multi = False)
+  B.setdiag(0)
+  B.eliminate_zeros()
+
+  if distances:
+    toc = time()
+
+    with stage('distances'):
+      lcc = np.flatnonzero(labels == sizes.argmax())
+      dists = approx_dists(B[lcc][:, lcc], exact = distances == 'exact', workers = workers)
+
+      info.update({'distance': float(dists['distance']), 'diameter': dists['diameter'], 'distance_ci': tuple(map(float, dists['ci']))})
+
+      print("{0:>15s} | {1:.3f} ({2:,d})".format('Distances', info['distance'], info['diameter']))
+
+    times['distances'] = time() - toc
+
+  if clustering:
+    toc = time()
+
+    info['clustering'] = triangle_clustering(G, workers)['average']
+
+    print("{0:>15s} | {1:.6f}".format('Clustering', info['clustering']))
+
+    times['clustering'] = time() - toc
+
+  info['time'] = time() - tic
+  info['times'] = times
+
+  print("{0:>15s} | {1:.1f} sec\n".format('Time', info['time']))
+
+  return info
+
+class GraphInfo:
+  """
+  Standard statistics of undirected multigraph G maintained under edge insertions and deletions.
+
+  Nodes are integer indices of the compact graph, which keeps adjacency
+  dictionaries with edge multiplicities next to degree histogram, numbers of
+  self-loops and parallel edges, union-find of connected components and
+  triangles of nodes. Inserting or deleting an edge updates all of them in
+  time proportional to the smaller degree of its endpoints, after which the
+  table of graph_info is printed in constant time. Deleting the last edge
+  between two nodes may split a component, so components are rebuilt once
+  before the next table. Distances are not maintained.
+  """
+
+  def __init__(self, G):
+    G = from_networkx(G)
+    self.name = G.name
+
+    A = G.adjacency()
+    loops = A.diagonal()
+
+    self.adj = [dict(zip(A.indices[A.indptr[i]:A.indptr[i + 1]].tolist(), A.data[A.indptr[i]:A.indptr[i + 1]].tolist())) for i in range(A.shape[0])]
+    self.degrees = (np.asarray(A.sum(axis = 1)).ravel() + loops).astype(np.int64).tolist()
+
+    self.m = int((A.sum() + loops.sum()) // 2)
+    self.loops = int(loops.sum())
+    extra = int((loops - 1).clip(0).sum())
+    self.parallel = (int((A.data - 1).sum()) - extra) // 2 + extra
+
+    self.hist = {}
+    for k in self.degrees:
+      self.hist[k] = self.hist.get(k, 0) + 1
+    self.kmin = min(self.hist) if self.hist else 0
+    self.kmax = max(self.hist) if self.hist else 0
+
+    cs = triangle_clustering(G)
+
+    self.simple = [len(a) - (i in a) for i, a in enumerate(self.adj)]
+    self.triangles = cs['triangles'].tolist()
+    self.clustering = float(cs['clustering'].sum())
+    self.count = sum(self.triangles) // 3
+
+    self._rebuild()
+    self.time = 0.0
+
+  def __len__(self):
+    return len(self.adj)
+
+  def _rebuild(self):
+    """
+    Recompute union-find of connected components from adjacency dictionaries.
+    """
+
+    n = len(self)
+    rows = np.repeat(np.arange(n), [len(a) for a in self.adj])
+    cols = np.fromiter((j for a in self.adj for j in a), dtype = np.int64, count = len(rows))
+
+    self.components, labels = csgraph.connected_components(sp.csr_matrix((np.ones(len(rows)), (rows, cols)), shape = (n, n)), directed = False)
+    reps = np.unique(labels, return_index = True)[1]
+    sizes = np.bincount(labels)
+
+    self.parent = reps[labels].tolist()
+    self.size = dict(zip(reps.tolist(), sizes.tolist()))
+    self.lcc = int(sizes.max()) if n > 0 else 0
+    self.dirty = False
+
+  def _find(self, i):
+    """
+    Find representative of component of node i with path halving.
+    """
+
+    parent = self.parent
+    while parent[i] != i:
+      parent[i] = parent[parent[i]]
+      i = parent[i]
+
+    return i
+
+  def _union(self, i, j):
+    """
+    Merge components of nodes i and j by size.
+    """
+
+    i, j = self._find(i), self._find(j)
+    if i != j:
+      if self.size[i] < self.size[j]:
+        i, j = j, i
+
+      self.parent[j] = i
+      self.size[i] += self.size.pop(j)
+
+      self.components -= 1
+      self.lcc = max(self.lcc, self.size[i])
+
+  def _degree(self, i, d):
+    """
+    Change degree of node i by d and update degree histogram with its extremes.
+    """
+
+    hist, k = self.hist, self.degrees[i]
+    self.degrees[i] = k + d
+
+    hist[k] -= 1
+    hist[k + d] = hist.get(k + d, 0) + 1
+
+    self.kmin, self.kmax = min(self.kmin, k + d), max(self.kmax, k + d)
+    while hist.get(self.kmin, 0) == 0 and self.kmin < self.kmax:
+      self.kmin += 1
+    while hist.get(self.kmax, 0) == 0 and self.kmax > self.kmin:
+      self.kmax -= 1
+
+  def _local(self, i, t, k):
+    """
+    Change triangles and simple degree of node i by t and k and update sum of local clustering.
+    """
+
+    c = lambda i: 2 * self.triangles[i] / (self.simple[i] * (self.simple[i] - 1)) if self.simple[i] > 1 else 0.0
+
+    old = c(i)
+    self.triangles[i] += t
+    self.simple[i] += k
+    self.clustering += c(i) - old
+
+  def _link(self, u, v, d):
+    """
+    Update triangles of nodes u, v and their common neighbors for simple edge u-v added with d = 1 or removed with d = -1.
+    """
+
+    a, b = (self.adj[u], self.adj[v]) if len(self.adj[u]) < len(self.adj[v]) else (self.adj[v], self.adj[u])
+    common = [w for w in a if w in b and w != u and w != v]
+
+    for w in common:
+      self._local(w, d, 0)
+    self._local(u, d * len(common), d)
+    self._local(v, d * len(common), d)
+    self.count += d * len(common)
+
+  def add_node(self):
+    """
+    Add isolated node and return its index.
+    """
+
+    self.adj.append({})
+    self.degrees.append(0)
+    self.simple.append(0)
+    self.triangles.append(0)
+
+    self.hist[0] = self.hist.get(0, 0) + 1
+    self.kmin = 0
+
+    self.parent.append(len(self) - 1)
+    self.size[len(self) - 1] = 1
+    self.components += 1
+    self.lcc = max(self.lcc, 1)
+
+    return len(self) - 1
+
+  def add_edge(self, u, v):
+    """
+    Add edge between nodes u and v.
+    """
+
+    tic = time()
+
+    mult = self.adj[u].get(v, 0)
+    self.adj[u][v] = self.adj[v][u] = mult + 1
+
+    self.m += 1
+    if u == v:
+      self.loops += 1
+      self._degree(u, 2)
+    else:
+      self._degree(u, 1)
+      self._degree(v, 1)
+
+    if mult > 0:
+      self.parallel += 1
+    elif u != v:
+      self._link(u, v, 1)
+      if not self.dirty:
+        self._union(u, v)
+
+    self.time += time() - tic
+
+  def remove_edge(self, u, v):
+    """
+    Remove edge between nodes u and v.
+    """
+
+    tic = time()
+
+    mult = self.adj[u].get(v, 0)
+    if mult == 0:
+      raise ValueError('The edge {:d}-{:d} is not in the graph'.format(u, v))
+
+    if mult > 1:
+      self.adj[u][v] = self.adj[v][u] = mult - 1
+      self.parallel -= 1
+    else:
+      del self.adj[u][v]
+      if u != v:
+        del self.adj[v][u]
+        self._link(u, v, -1)
+        self.dirty = True
+
+    self.m -= 1
+    if u == v:
+      self.loops -= 1
+      self._degree(u, -2)
+    else:
+      self._degree(u, -1)
+      self._degree(v, -1)
+
+    self.time += time() - tic
+
+  def add_edges_from(self, edges):
+    """
+    Add edges given as pairs of nodes.
+    """
+
+    for u, v in edges:
+      self.add_edge(u, v)
+
+  def remove_edges_from(self, edges):
+    """
+    Remove edges given as pairs of nodes.
+    """
+
+    for u, v in edges:
+      self.remove_edge(u, v)
+
+  def info(self, clustering = False):
+    """
+    Print out and return standard statistics of current graph as in graph_info.
+
+    Time is the total time spent maintaining statistics under updates.
+    """
+
+    if self.dirty:
+      tic = time()
+      self._rebuild()
+      self.time += time() - tic
+
+    n, m = len(self), self.m
+
+    print("{0:>15s} | '{1:s}'".format('Graph', self.name.replace('_', '-')))
+
+    info = {'name': self.name, 'multi': self.parallel > 0}
+
+    print("{0:>15s} | '{1:s}'".format('Type', '===' if info['multi'] else '---'))
+
+    info.update({'nodes': n, 'isolates': self.hist.get(0, 0), 'edges': m, 'selfloops': self.loops})
+
+    print("{0:>15s} | {1:,d} ({2:,d})".format('Nodes', n, info['isolates']))
+    print("{0:>15s} | {1:,d} ({2:,d})".format('Edges', m, info['selfloops']))
+
+    info.update({'degree': 2 * m / n, 'degree_min': self.kmin, 'degree_max': self.kmax, 'density': 2 * m / n / (n - 1) if n > 1 else 0.0})
+
+    print("{0:>15s} | {1:.1f} ({2:,d}, {3:,d})".format('Degree', info['degree'], info['degree_min'], info['degree_max']))
+    print("{0:>15s} | {1:.8f}".format('Density', info['density']))
+
+    info.update({'components': self.components, 'lcc': self.lcc})
+
+    print("{0:>15s} | {1:.1f}% ({2:,d})".format('Components', 100 * info['lcc'] / n, info['components']))
+
+    if clustering:
+      info.update({'clustering': self.clustering / n, 'triangles': self.count})
+
+      print("{0:>15s} | {1:.6f}".format('Clustering', info['clustering']))
+
+    info['time'] = self.time
+
+    print("{0:>15s} | {1:.1f} sec\n".format('Time', info['time']))
+
+    return info
@@ -0,0 +1,122 @@
+import os
+from time import *
+
+import numpy as np
+
+from pajek import parse_vertices, lookup
+
+def stream_pajek(file, path = '../nets', chunk = 1000000):
+  """
+  Yield vertices and edges of specified file in Pajek format in chunks of lines.
+
+  Vertices are yielded as ('vertices', (ids, labels, clusters)) and edges or
+  arcs as ('edges', (sources, targets)) with Pajek identifiers of nodes, where
+  each chunk holds at most chunk records.
+  """
+
+  with open(os.path.join(path, file + '.net'), 'r') as f:
+    section, lines = None, []
+    for line in f:
+      if line.startswith('*'):
+        if len(lines) > 0:
+          yield _chunk(section, lines)
+        section, lines = line[1:].split()[0].lower(), []
+      elif section in ('vertices', 'edges', 'arcs') and line.strip() != '':
+        lines.append(line)
+        if len(lines) >= chunk:
+          yield _chunk(section, lines)
+          lines = []
+
+    if len(lines) > 0:
+      yield _chunk(section, lines)
+
+def _chunk(section, lines):
+  """
+  Parse chunk of lines of section in Pajek format into arrays.
+  """
+
+  if section == 'vertices':
+    return 'vertices', parse_vertices(''.join(lines))
+
+  cols = len(lines[0].split())
+  tokens = ''.join(lines).split()
+  if len(tokens) == cols * len(lines):
+    edges = np.array(tokens, dtype = np.int64) if cols == 2 else np.array(tokens[0::cols] + tokens[1::cols], dtype = np.int64).reshape(2, -1).T
+    edges = edges.reshape(-1, 2)
+  else:
+    edges = np.array([line.split()[:2] for line in lines], dtype = np.int64)
+
+  return 'edges', (edges[:, 0], edges[:, 1])
+
+def _grow(a, size, fill):
+  """
+  Extend array a to specified size with fill values.
+  """
+
+  if len(a) >= size:
+    return a
+
+  return np.concatenate([a, np.full(size - len(a), fill, dtype = a.dtype)])
+
+def stream_info(file, path = '../nets', chunk = 1000000, multi = True):
+  """
+  Compute and print out standard statistics of undirected multigraph in specified file in one pass.
+
+  Memory is bounded by the number of nodes and chunk size, except for multi-edge
+  detection that keeps sorted distinct edges until the first parallel edge is
+  found, which takes O(m) memory for simple graphs with m edges. Each chunk is
+  merged into the sorted edges in linear time. Detection is skipped when multi
+  is False, which keeps memory bounded.
+  """
+
+  tic = time()
+
+  print("{0:>15s} | '{1:s}'".format('Graph', file.replace('_', '-')))
+
+  index, ks = np.zeros(0, dtype = np.int64), np.zeros(0, dtype = np.int64)
+  n, m, loops = 0, 0, 0
+  keys, parallel = np.zeros(0, dtype = np.int64), False
+
+  for section, data in stream_pajek(file, path, chunk):
+    if section == 'vertices':
+      ids = data[0]
+      index = _grow(index, ids.max() + 1 if len(ids) > 0 else 0, -1)
+      index[ids] = np.arange(n, n + len(ids))
+      n += len(ids)
+    else:
+      ks = _grow(ks, n, 0)
+
+      i, j = lookup(index, data[0]), lookup(index, data[1])
+
+      m += len(i)
+      loops += int(np.count_nonzero(i == j))
+
+      ks += np.bincount(i, minlength = n) + np.bincount(j, minlength = n)
+
+      if multi and not parallel:
+        chunk_keys = np.sort(np.minimum(i, j) * n + np.maximum(i, j))
+        positions = np.searchsorted(keys, chunk_keys)
+        hits = np.minimum(positions, max(len(keys) - 1, 0))
+        if np.any(chunk_keys[1:] == chunk_keys[:-1]) or len(keys) > 0 and np.any(keys[hits] == chunk_keys):
+          parallel, keys = True, None
+        else:
+          keys = np.insert(keys, positions, chunk_keys)
+
+  ks = _grow(ks, n, 0)
+
+  info = {'name': file, 'multi': parallel, 'nodes': n, 'isolates': int(np.count_nonzero(ks == 0)), 'edges': m, 'selfloops': loops,
+    'degree': 2 * m / n, 'degree_min': int(ks.min()), 'degree_max': int(ks.max()), 'density': 2 * m / n / (n - 1) if n > 1 else 0.0}
+
+  print("{0:>15s} | '{1:s}'".format('Type', '===' if parallel else '---' if multi else '???'))
+
+  print("{0:>15s} | {1:,d} ({2:,d})".format('Nodes', n, info['isolates']))
+  print("{0:>15s} | {1:,d} ({2:,d})".format('Edges', m, loops))
+
+  print("{0:>15s} | {1:.1f} ({2:,d}, {3:,d})".format('Degree', info['degree'], info['degree_min'], info['degree_max']))
+  print("{0:>15s} | {1:.8f}".format('Density', info['density']))
+
+  info['time'] = time() - tic
+
+  print("{0:>15s} | {1:.1f} sec\n".format('Time', info['time']))
+
+  return info
@@ -1,91 +1,13 @@
 import os
 from time import *
-from random import sample
-
-import matplotlib.pyplot as plt
 
 import networkx as nx
 
-def read_pajek(file, path = '../nets'):
-  """
-  Construct undirected multigraph G from specified file in Pajek format.
-  """
-  
-  G = nx.read_pajek(os.path.join(path, file + '.net'))
-  G.name = file
-  
-  return G
-
-def approx_dists(G, n = 100):
-  """
-  Compute approximate average distance and diameter of undirected multigraph G.
-  """
-  
-  ds = []
-  for i in G.nodes() if len(G) <= n else sample(G.nodes(), n):
-    ds.extend([d for d in nx.shortest_path_length(G, source = i).values() if d > 0])
-    
-  return sum(ds) / len(ds), max(ds)
-
-def graph_info(G):
-  """
-  Compute and print out standard statistics of undirected multigraph G.
-  """
-  
-  tic = time()
-  
-  print("{0:>15s} | '{1:s}'".format('Graph', G.name.replace('_', '-')))
-  
-  multi = False
-  for edge in G.edges():
-    if G.number_of_edges(edge[0], edge[1]) > 1:
-      multi = True
-      break
-      
-  print("{0:>15s} | '{1:s}'".format('Type', '===' if multi else '---'))
-  
-  n = G.number_of_nodes()
-  m = G.number_of_edges()
-  
-  print("{0:>15s} | {1:,d} ({2:,d})".format('Nodes', n, nx.number_of_isolates(G)))
-  print("{0:>15s} | {1:,d} ({2:,d})".format('Edges', m, nx.number_of_selfloops(G)))
-  
-  ks = [k for _, k in G.degree()]
-  
-  print("{0:>15s} | {1:.1f} ({2:,d}, {3:,d})".format('Degree', 2 * m / n, min(ks), max(ks)))
-  print("{0:>15s} | {1:.8f}".format('Density', 2 * m / n / (n - 1)))
-  
-  CCs = sorted(nx.connected_components(G), key = len, reverse = True)
-
-  print("{0:>15s} | {1:.1f}% ({2:,d})".format('Components', 100 * len(CCs[0]) / n, len(CCs)))
-
-  d, D = approx_dists(G.subgraph(CCs[0]))
-
-  print("{0:>15s} | {1:.3f} ({2:,d})".format('Distances', d, D))
-
-  C = nx.average_clustering(G if type(G) == nx.Graph else nx.Graph(G))
-
-  print("{0:>15s} | {1:.6f}".format('Clustering', C))
-  
-  print("{0:>15s} | {1:.1f} sec\n".format('Time', time() - tic))
-
-def deg_dist(G):
-  """
-  Plots degree distribution of undirected multigraph G.
-  """
-  
-  nk = {}
-  for _, k in G.degree():
-    if k not in nk:
-      nk[k] = 0
-    nk[k] += 1
-  ks = list(nk)
-  
-  plt.loglog(ks, [nk[k] / len(G) for k in ks], '*k')
-  plt.ylabel('Fraction of nodes')
-  plt.xlabel('Node degree')
-  plt.title(G.name)
-  plt.show()
+from pajek import read_pajek
+from stats import graph_info
+from stream import stream_info
+from models import ensemble_info
+from degrees import degree_info
 
 toc = time()
 
@@ -111,38 +33,28 @@ G.add_edge('foo', 'bar', weight = 2.0)
 
 # Prints out statistics of toy graph
 
-graph_info(G)
+graph_info(G, distances = True, clustering = True)
 
-for file in ['karate', 'women', 'dolphins', 'ingredients', 'darknet', 'ppi', 'internet', 'amazon']: # 'aps', 'google', 'texas'
+for file in ['karate', 'women', 'dolphins', 'ingredients', 'darknet', 'ppi']:
 
   # Constructs graph representing real network
   
-  G = read_pajek(file)
-  
-  # Prints out statistics of real network
-  
-  graph_info(G)
-  
-  n = G.number_of_nodes()
-  m = G.number_of_edges()
-
-  # Plots degree distribution of real network
+  K = read_pajek(file)
 
-  if n > 5000:
-    deg_dist(G)
+  # Prints out power-law fit and plots degree distribution of real network
 
-  # Prints out statistics of Erdös-Rényi random graph
+  degree_info(K, plot = len(K) > 5000)
 
-  ER = nx.gnm_random_graph(n, m)
-  ER.name = 'Erdös-Rényi'
+  # Prints out statistics of real network against ensembles of Erdös-Rényi
+  # random graphs and Barabási–Albert scale-free graphs
 
-  graph_info(ER)
+  ensemble_info(K, ('ER', 'BA'), k = 10)
 
-  # Prints out statistics of Barabási–Albert scale-free graph
+for file in ['internet', 'amazon', 'aps', 'google', 'texas']:
 
-  BA = nx.barabasi_albert_graph(n, round(m / n))
-  BA.name = 'Barabási–Albert'
+  # Prints out basic statistics of large real network in one pass
 
-  graph_info(BA)
+  if os.path.exists(os.path.join('..', 'nets', file + '.net')):
+    stream_info(file)
 
 print("{0:>15s} | {1:.1f} sec\n".format('Total', time() - toc))
@@ -0,0 +1,125 @@
+import os
+import tempfile
+
+import numpy as np
+
+from gensim.models import Word2Vec
+
+from parallel import pmap, workers_count
+from instrument import timed
+
+_graph = None
+
+def _init(indptr, indices, p, q):
+  """
+  Share CSR adjacency, its sorted edge keys and return and in-out parameters with worker process.
+  """
+
+  global _graph
+  n = len(indptr) - 1
+
+  _graph = (np.asarray(indptr), np.asarray(indices), np.repeat(np.arange(n), np.diff(indptr)) * n + indices, p, q)
+
+def _neighbors(indptr, indices, nodes, rng):
+  """
+  Uniformly random neighbors of nodes with at least one neighbor.
+  """
+
+  return indices[indptr[nodes] + (rng.random(len(nodes)) * (indptr[nodes + 1] - indptr[nodes])).astype(np.int64)]
+
+def _walks(args):
+  """
+  Generate random walks of given length from block of start nodes in worker process.
+  """
+
+  starts, length, seed = args
+  indptr, indices, keys, p, q = _graph
+  n = len(indptr) - 1
+
+  rng = np.random.default_rng(seed)
+  sizes = np.diff(indptr)
+
+  walks = np.full((len(starts), length), -1, dtype = np.int32)
+  walks[:, 0] = starts
+
+  alive = np.flatnonzero(sizes[starts] > 0)
+  if length > 1 and len(alive) > 0:
+    walks[alive, 1] = _neighbors(indptr, indices, starts[alive], rng)
+
+  top = max(1 / p, 1, 1 / q)
+  for step in range(2, length if len(alive) > 0 else 0):
+    prev, cur = walks[alive, step - 2].astype(np.int64), walks[alive, step - 1].astype(np.int64)
+
+    if p == q == 1:
+      walks[alive, step] = _neighbors(indptr, indices, cur, rng)
+      continue
+
+    pending = np.arange(len(alive))
+    while len(pending) > 0:
+      x = _neighbors(indptr, indices, cur[pending], rng)
+      t = prev[pending]
+
+      queries = t * n + x
+      linked = keys[np.minimum(np.searchsorted(keys, queries), len(keys) - 1)] == queries
+      weights = np.where(x == t, 1 / p, np.where(linked, 1, 1 / q))
+
+      accept = rng.random(len(pending)) * top < weights
+      walks[alive[pending[accept]], step] = x[accept]
+      pending = pending[~accept]
+
+  return walks
+
+@timed('walks')
+def random_walks(G, length = 80, walks = 10, p = 1, q = 1, workers = None, seed = None):
+  """
+  Generate node2vec random walks over undirected graph G as compact int32 array.
+
+  Each round starts one walk from every node in random order, where rounds
+  are split into blocks of start nodes processed by worker processes and
+  every block advances all its walks together one step at a time. With
+  p = q = 1 walks are uniform, while otherwise the second-order transition
+  with return parameter p and in-out parameter q is sampled by rejection
+  from uniform proposals, which needs no precomputed transition tables.
+  Returns array of walks in rows with -1 after walks that hit isolated nodes.
+  """
+
+  n = len(G)
+  rng = np.random.default_rng(seed)
+
+  blocks = []
+  for _ in range(walks):
+    blocks.extend(block for block in np.array_split(rng.permutation(n), 4 * workers_count(workers, n)) if len(block) > 0)
+
+  seeds = np.random.SeedSequence(seed).generate_state(len(blocks)).tolist()
+
+  return np.concatenate(pmap(_walks, [(block, length, s) for block, s in zip(blocks, seeds)], workers, _init, (G.indptr, G.indices, p, q)))
+
+@timed('embedding')
+def embed(walks, n, dimensions = 32, workers = None, **params):
+  """
+  Train skip-gram node embeddings on walks and return matrix of embeddings of nodes 0, ..., n - 1.
+
+  Walks are streamed to a temporary corpus file of integer tokens, which
+  Word2Vec reads in its own worker threads without building sentences in
+  Python. Remaining parameters are passed to Word2Vec as in node2vec.
+  """
+
+  params = {'sg': 1, 'min_count': 1, **params}
+
+  with tempfile.TemporaryDirectory() as path:
+    corpus = os.path.join(path, 'walks.txt')
+
+    with open(corpus, 'w') as file:
+      for block in np.array_split(walks, max(1, len(walks) // 10000)):
+        full = (block >= 0).all(axis = 1)
+        np.savetxt(file, block[full], fmt = '%d')
+        for walk in block[~full]:
+          file.write(' '.join(map(str, walk[walk >= 0].tolist())) + '\n')
+
+    model = Word2Vec(corpus_file = corpus, vector_size = dimensions, workers = workers_count(workers), **params)
+
+  vectors = np.zeros((n, dimensions), dtype = np.float32)
+  for i, key in enumerate(model.wv.index_to_key):
+    vectors[int(key)] = model.wv.vectors[i]
+
+  return vectors